@@ -1,10 +1,9 @@
 from aqt import gui_hooks, mw
-from datetime import date
 
 from .logic.streak_manager import get_streak_manager
 from .hooks.toolbar import setup_toolbar
 from .ui.streak_popup import open_streak_popup_with_manager
-from .ui.review_popup import StreakAnimationPopup
+from .ui.review_popup import prepare_streak_animation_popup, show_streak_animation_popup
 
 DEBUG_FORCE_ANIMATION_POPUP = False
 
@@ -18,7 +17,8 @@ def calculate_animation_bounds(current_streak):
 def _on_profile_open():
     try:
         streak_manager = get_streak_manager()
-        streak_manager.recalculate_streak()
+        streak_manager.run_startup()
+        prepare_streak_animation_popup(mw)
     except Exception as e:
         print(f"AnkiStreak: Error on profile open: {e}")
 
@@ -36,21 +36,19 @@ gui_hooks.sync_did_finish.append(_on_sync_finish)
 def show_streak_animation(*args, **kwargs):
     try:
         streak_manager = get_streak_manager()
-        today = date.today()
-        reviews_today = streak_manager.get_review_count_for_date(today)
+        already_reviewed_today = streak_manager.has_reviewed_today()
         current_streak = streak_manager.get_current_streak_length()
+        streak_manager.update_streak_for_review(*args, **kwargs)
 
         should_show = False
         if DEBUG_FORCE_ANIMATION_POPUP:
             should_show = True
-        elif reviews_today == 1 and current_streak >= 1:
-            should_show = True
+        elif not already_reviewed_today and current_streak >= 1:
+            should_show = streak_manager.get_review_count_for_date(streak_manager.get_today()) == 1
 
         if should_show:
             prev, curr = calculate_animation_bounds(current_streak)
-            popup = StreakAnimationPopup(mw, prev, curr)
-            popup.show()
-            streak_manager.recalculate_streak()
+            show_streak_animation_popup(mw, prev, curr)
 
     except Exception as e:
         print(f"AnkiStreak: Error showing streak animation: {e}")
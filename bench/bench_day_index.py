@@ -0,0 +1,59 @@
+"""Compare the string-keyed streak walk with the day-ordinal engine.
+
+Run from the add-on folder:  python bench/bench_day_index.py
+"""
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from logic.day_index import DayIndex  # noqa: E402
+
+YEARS = 10
+REPEAT = 200
+
+
+def legacy_streak(today: date, reviewed: set, frozen: set) -> int:
+    streak = 0
+    check_date = today
+    while True:
+        date_str = check_date.strftime("%Y-%m-%d")
+        if date_str in reviewed or date_str in frozen:
+            streak += 1
+        else:
+            break
+        check_date -= timedelta(days=1)
+        if streak > 365 * 10:
+            break
+    return streak
+
+
+def main():
+    today = date.today()
+    days = [today - timedelta(days=i) for i in range(365 * YEARS)]
+    frozen_days = days[::97]
+    reviewed_days = [day for day in days if day not in set(frozen_days)]
+
+    reviewed_keys = {day.strftime("%Y-%m-%d") for day in reviewed_days}
+    frozen_keys = {day.strftime("%Y-%m-%d") for day in frozen_days}
+    index = DayIndex((day.toordinal() for day in reviewed_days), (day.toordinal() for day in frozen_days))
+
+    assert legacy_streak(today, reviewed_keys, frozen_keys) == min(index.streak_ending_at(today.toordinal()), 365 * 10 + 1)
+
+    legacy = min(timeit.repeat(lambda: legacy_streak(today, reviewed_keys, frozen_keys), number=REPEAT, repeat=3))
+    ordinal = min(timeit.repeat(lambda: index.streak_ending_at(today.toordinal()), number=REPEAT, repeat=3))
+
+    print(f"{YEARS}-year history, {REPEAT} streak lookups")
+    print(f"  string walk:   {legacy * 1000:9.2f} ms")
+    print(f"  ordinal index: {ordinal * 1000:9.2f} ms  ({legacy / ordinal:.0f}x)")
+
+    # All-time heatmap input: per-day states for the whole history, per lookup.
+    first = today.replace(year=today.year - YEARS, month=1, day=1).toordinal()
+    states = min(timeit.repeat(lambda: index.day_states(first, today.toordinal()), number=REPEAT, repeat=3))
+    print(f"  day states:    {states * 1000 / REPEAT:9.3f} ms per {YEARS}-year range")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Time the add-on's hot paths against synthetic collections, without Anki.
+
+A stand-in aqt package (bench/standin) provides mw, gui_hooks, a SQLite
+backed col.db and sched.day_cutoff. Collections are generated once per
+size into --data-dir and reused by later runs.
+
+Run from the add-on folder:
+
+    python bench/bench_streak.py                       # 10k and 1M rows
+    python bench/bench_streak.py --sizes 10k:1,1m:5,5m:15 --output baseline.json
+    python bench/bench_streak.py --baseline baseline.json
+
+Sizes are ROWS[:YEARS], with k/m suffixes for rows.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+ADDON_PACKAGE = "ankistreak"
+
+sys.path.insert(0, os.path.join(BENCH_DIR, "standin"))
+sys.path.insert(0, BENCH_DIR)
+
+import aqt  # noqa: E402
+from synthetic_collection import ensure_collection  # noqa: E402
+
+DEFAULT_SIZES = "10k:1,1m:5"
+DEFAULT_YEARS = {10_000: 1, 1_000_000: 5, 5_000_000: 15}
+# A timing this much slower than the baseline is reported as a regression.
+REGRESSION_RATIO = 1.25
+
+
+def load_addon():
+    # The add-on's own __init__ wires up the Qt UI, so load it as a bare
+    # package and import only the logic modules.
+    if ADDON_PACKAGE not in sys.modules:
+        package = types.ModuleType(ADDON_PACKAGE)
+        package.__path__ = [ADDON_DIR]
+        sys.modules[ADDON_PACKAGE] = package
+    from ankistreak.logic import streak_manager, streak_history_manager
+    return streak_manager, streak_history_manager
+
+
+def parse_sizes(spec: str):
+    sizes = []
+    for item in spec.split(","):
+        rows_text, _, years_text = item.strip().partition(":")
+        multiplier = {"k": 1_000, "m": 1_000_000}.get(rows_text[-1].lower(), 1)
+        rows = int(float(rows_text.rstrip("kKmM")) * multiplier)
+        years = int(years_text) if years_text else DEFAULT_YEARS.get(rows, 1)
+        sizes.append((rows, years))
+    return sizes
+
+
+def size_label(rows: int, years: int) -> str:
+    if rows >= 1_000_000 and rows % 1_000_000 == 0:
+        rows_text = f"{rows // 1_000_000}m"
+    elif rows >= 1_000 and rows % 1_000 == 0:
+        rows_text = f"{rows // 1_000}k"
+    else:
+        rows_text = str(rows)
+    return f"{rows_text}-{years}y"
+
+
+def time_calls(fn, repeat: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"median": statistics.median(samples), "min": min(samples), "runs": repeat}
+
+
+class _Card:
+    def __init__(self, card_id: int, deck_id: int, time_taken_ms: int):
+        self.id = card_id
+        self.did = deck_id
+        self._time_taken_ms = time_taken_ms
+
+    def time_taken(self) -> int:
+        return self._time_taken_ms
+
+
+def bench_collection(collection_path: str, rows: int, years: int, repeat: int, answers: int) -> dict:
+    streak_manager_module, history_module = load_addon()
+    timings = {}
+    addon_folder = tempfile.mkdtemp(prefix="ankistreak-bench-")
+    try:
+        aqt.gui_hooks.reset()
+        streak_manager_module.StreakManager._instance = None
+        streak_manager_module._global_streak_manager_instance = None
+        col = aqt.open_collection(collection_path, addon_folder)
+
+        # Profile open with an empty history: load, full revlog import,
+        # recalculation and toolbar state.
+        manager = streak_manager_module.get_streak_manager()
+        start = time.perf_counter()
+        manager.run_startup()
+        timings["startup_full_import"] = {"median": (time.perf_counter() - start) * 1000, "min": None, "runs": 1}
+
+        def fresh_history():
+            shutil.rmtree(os.path.join(addon_folder, "addon"), ignore_errors=True)
+            fresh_history.history = history_module.StreakHistoryManager()
+
+        timings["import_full"] = time_calls(
+            lambda: fresh_history.history.import_reviewed_days_from_log(),
+            repeat, setup=fresh_history)
+        timings["import_incremental"] = time_calls(
+            lambda: manager.streak_history.import_reviewed_days_from_log(), repeat)
+
+        def drop_day_index():
+            manager._day_index = None
+            manager._recalculated_day = None
+
+        timings["recalculate_streak"] = time_calls(manager.recalculate_streak, repeat)
+        timings["recalculate_streak_cold_index"] = time_calls(manager.recalculate_streak, repeat,
+                                                              setup=drop_day_index)
+
+        today = manager.get_today()
+        timings["review_details_cold"] = time_calls(
+            lambda: manager.get_review_details_for_date(today), repeat, setup=manager.review_stats.clear)
+        timings["review_details_warm"] = time_calls(
+            lambda: manager.get_review_details_for_date(today), repeat)
+        timings["month_totals_cold"] = time_calls(
+            lambda: manager.get_review_totals_for_month(today.year, today.month), repeat,
+            setup=manager.review_stats.clear)
+
+        # The reviewer_did_answer_card path: a new revlog row, then the hook.
+        rng = random.Random(rows)
+        card_count = col.db.scalar("SELECT count() FROM cards")
+        manager.get_review_details_for_date(today)
+        manager.get_review_totals_for_month(today.year, today.month)
+        last_id = col.db.scalar("SELECT max(id) FROM revlog")
+        answer_samples = []
+        for _ in range(answers):
+            card_id = rng.randint(1, card_count)
+            card = _Card(card_id, col.db.scalar("SELECT did FROM cards WHERE id = ?", card_id), 4000)
+            last_id = max(last_id + 1, int(time.time() * 1000))
+            col.db.execute(
+                "INSERT INTO revlog (id, cid, usn, ease, ivl, lastIvl, factor, time, type) "
+                "VALUES (?, ?, 0, 3, 1, 0, 2500, 4000, 1)", last_id, card.id)
+            start = time.perf_counter()
+            manager.update_streak_for_review(None, card, 3)
+            answer_samples.append((time.perf_counter() - start) * 1000)
+        timings["answer_hook"] = {"median": statistics.median(answer_samples), "min": min(answer_samples),
+                                  "runs": answers}
+
+        manager.flush_data()
+        col.close()
+    finally:
+        shutil.rmtree(addon_folder, ignore_errors=True)
+
+    return {"rows": rows, "years": years, "timings_ms": timings}
+
+
+def compare_with_baseline(results: dict, baseline: dict) -> int:
+    regressions = 0
+    for label, result in results.items():
+        previous = baseline.get("results", {}).get(label)
+        if not previous:
+            continue
+        print(f"\n{label} vs baseline")
+        for name, timing in result["timings_ms"].items():
+            old = previous["timings_ms"].get(name)
+            if not old or not old["median"]:
+                continue
+            ratio = timing["median"] / old["median"]
+            flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+            regressions += bool(flag)
+            print(f"  {name:32} {old['median']:10.3f} -> {timing['median']:10.3f} ms  ({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated ROWS[:YEARS] (default: %(default)s)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "ankistreak-bench-data"),
+                        help="where generated collections are kept (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timing (default: %(default)s)")
+    parser.add_argument("--answers", type=int, default=200, help="answers timed per size (default: %(default)s)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a JSON file written by --output")
+    args = parser.parse_args()
+
+    results = {}
+    for rows, years in parse_sizes(args.sizes):
+        label = size_label(rows, years)
+        start = time.perf_counter()
+        path = ensure_collection(args.data_dir, rows, years, args.seed)
+        prepare_s = time.perf_counter() - start
+        print(f"{label}: {rows} reviews over {years} year(s) ({path}, ready in {prepare_s:.1f} s)")
+
+        results[label] = bench_collection(path, rows, years, args.repeat, args.answers)
+        for name, timing in results[label]["timings_ms"].items():
+            print(f"  {name:32} {timing['median']:10.3f} ms")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare_with_baseline(results, json.load(f))
+        if regressions:
+            print(f"\n{regressions} timing(s) more than {REGRESSION_RATIO:.2f}x slower than the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
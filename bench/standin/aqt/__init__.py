@@ -0,0 +1,130 @@
+# Minimal stand-in for the parts of aqt the add-on's logic modules touch, so
+# they can be imported and timed without Anki. The collection is a real
+# SQLite file with the revlog, cards and decks tables the add-on queries.
+import copy
+import sqlite3
+from datetime import datetime, timedelta
+
+
+class _Hook(list):
+    def __call__(self, *args, **kwargs):
+        for callback in list(self):
+            callback(*args, **kwargs)
+
+
+class _GuiHooks:
+    def __getattr__(self, name):
+        hook = _Hook()
+        setattr(self, name, hook)
+        return hook
+
+    def reset(self):
+        self.__dict__.clear()
+
+
+gui_hooks = _GuiHooks()
+
+
+class _DB:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+    def all(self, sql, *args):
+        return self._conn.execute(sql, args).fetchall()
+
+    def list(self, sql, *args):
+        return [row[0] for row in self._conn.execute(sql, args)]
+
+    def scalar(self, sql, *args):
+        row = self._conn.execute(sql, args).fetchone()
+        return row[0] if row else None
+
+    def first(self, sql, *args):
+        return self._conn.execute(sql, args).fetchone()
+
+    def execute(self, sql, *args):
+        self._conn.execute(sql, args)
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+class _Scheduler:
+    def __init__(self, rollover_hour: int = 4):
+        self.rollover_hour = rollover_hour
+
+    @property
+    def day_cutoff(self) -> int:
+        now = datetime.now()
+        cutoff = now.replace(hour=self.rollover_hour, minute=0, second=0, microsecond=0)
+        if cutoff <= now:
+            cutoff += timedelta(days=1)
+        return int(cutoff.timestamp())
+
+
+class _DeckManager:
+    def __init__(self, db: _DB):
+        self._db = db
+        self._names = None
+
+    def name(self, did: int) -> str:
+        if self._names is None:
+            self._names = dict(self._db.all("SELECT id, name FROM decks"))
+        return self._names.get(did, "[no deck]")
+
+
+class Collection:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = _DB(path)
+        self.sched = _Scheduler()
+        self.decks = _DeckManager(self.db)
+        self._config = {}
+
+    def get_config(self, key, default=None):
+        return copy.deepcopy(self._config.get(key, default))
+
+    def set_config(self, key, value):
+        self._config[key] = copy.deepcopy(value)
+
+    def close(self):
+        self.db.close()
+
+
+class _ProfileManager:
+    def __init__(self, addon_folder: str, name: str = "Bench"):
+        self._addon_folder = addon_folder
+        self.name = name
+
+    def addonFolder(self):
+        return self._addon_folder
+
+
+class _TaskManager:
+    def run_in_background(self, task, on_done=None):
+        from concurrent.futures import Future
+
+        future = Future()
+        try:
+            future.set_result(task())
+        except Exception as e:
+            future.set_exception(e)
+        if on_done:
+            on_done(future)
+
+
+class AnkiQt:
+    def __init__(self):
+        self.col = None
+        self.pm = None
+        self.taskman = _TaskManager()
+
+
+mw = AnkiQt()
+
+
+def open_collection(path: str, addon_folder: str) -> Collection:
+    mw.col = Collection(path)
+    mw.pm = _ProfileManager(addon_folder)
+    return mw.col
@@ -0,0 +1,28 @@
+# QueryOp runs its op synchronously on the calling thread, so timings include
+# the background work the add-on would hand to Anki's task manager.
+
+
+class QueryOp:
+    def __init__(self, parent, op, success):
+        self._op = op
+        self._success = success
+        self._failure = None
+
+    def failure(self, callback):
+        self._failure = callback
+        return self
+
+    def with_progress(self, label=None):
+        return self
+
+    def run_in_background(self):
+        from aqt import mw
+
+        try:
+            result = self._op(mw.col)
+        except Exception as e:
+            if self._failure is None:
+                raise
+            self._failure(e)
+            return
+        self._success(result)
@@ -0,0 +1,48 @@
+# Timers never fire on their own here; the benchmark calls fire() or the
+# add-on's flush methods directly.
+
+
+class _Signal:
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class QTimer:
+    def __init__(self, parent=None):
+        self.timeout = _Signal()
+        self._active = False
+        self._interval = 0
+        self._single_shot = False
+
+    def setSingleShot(self, single_shot: bool):
+        self._single_shot = single_shot
+
+    def isActive(self) -> bool:
+        return self._active
+
+    def start(self, msec: int = None):
+        if msec is not None:
+            self._interval = msec
+        self._active = True
+
+    def stop(self):
+        self._active = False
+
+    def interval(self) -> int:
+        return self._interval
+
+    def fire(self):
+        if self._single_shot:
+            self._active = False
+        self.timeout.emit()
+
+    @staticmethod
+    def singleShot(msec, callback):
+        callback()
@@ -0,0 +1,102 @@
+"""Generate SQLite collections with a synthetic review log for benchmarks.
+
+Only the tables and columns the add-on reads are created. Reviews are spread
+over the requested number of years, ending now, with roughly one day in ten
+skipped so the streak history has gaps.
+"""
+import os
+import random
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE revlog (
+    id integer PRIMARY KEY,
+    cid integer NOT NULL,
+    usn integer NOT NULL,
+    ease integer NOT NULL,
+    ivl integer NOT NULL,
+    lastIvl integer NOT NULL,
+    factor integer NOT NULL,
+    time integer NOT NULL,
+    type integer NOT NULL
+);
+CREATE INDEX ix_revlog_cid ON revlog (cid);
+CREATE TABLE cards (
+    id integer PRIMARY KEY,
+    did integer NOT NULL
+);
+CREATE TABLE decks (
+    id integer PRIMARY KEY NOT NULL,
+    name text NOT NULL
+);
+"""
+
+DECK_COUNT = 12
+CARDS_PER_DAY = 20
+SKIP_DAY_PROBABILITY = 0.1
+BATCH_SIZE = 50_000
+
+
+def collection_path(data_dir: str, rows: int, years: int, seed: int) -> str:
+    return os.path.join(data_dir, f"collection-{rows}-{years}y-{seed}.sqlite")
+
+
+def generate_collection(path: str, rows: int, years: int, seed: int = 1):
+    rng = random.Random(seed)
+    days = years * 365
+    study_days = [day for day in range(days) if day == 0 or rng.random() >= SKIP_DAY_PROBABILITY]
+    per_day, extra = divmod(rows, len(study_days))
+    card_count = max(1, len(study_days) * CARDS_PER_DAY // 10)
+
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO decks (id, name) VALUES (?, ?)",
+                     [(deck_id, f"Deck {deck_id:02d}") for deck_id in range(1, DECK_COUNT + 1)])
+    conn.executemany("INSERT INTO cards (id, did) VALUES (?, ?)",
+                     ((card_id, rng.randint(1, DECK_COUNT)) for card_id in range(1, card_count + 1)))
+
+    # Review ids are millisecond timestamps. Each study day is one session
+    # starting within an hour of the same time of day, with reviews a few
+    # seconds apart; today's session ends a minute ago.
+    now_ms = int(time.time() * 1000)
+    day_ms = 86_400_000
+    batch = []
+    last_id = 0
+    for index, day in enumerate(sorted(study_days, reverse=True)):
+        count = per_day + (1 if index < extra else 0)
+        if day:
+            session_start = now_ms - day * day_ms + rng.randint(0, 3_600_000)
+        else:
+            session_start = now_ms - count * 12_000 - 60_000
+        review_id = max(last_id + 1, session_start)
+        for _ in range(count):
+            batch.append((review_id, rng.randint(1, card_count), rng.choice((1, 3, 3, 3, 4)), rng.randint(1_500, 15_000)))
+            last_id = review_id
+            review_id += rng.randint(2_000, 12_000)
+        if len(batch) >= BATCH_SIZE:
+            _insert_reviews(conn, batch)
+            batch = []
+    _insert_reviews(conn, batch)
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, path)
+
+
+def _insert_reviews(conn, batch):
+    conn.executemany(
+        "INSERT INTO revlog (id, cid, usn, ease, ivl, lastIvl, factor, time, type) "
+        "VALUES (?, ?, 0, ?, 1, 0, 2500, ?, 1)",
+        batch,
+    )
+
+
+def ensure_collection(data_dir: str, rows: int, years: int, seed: int = 1) -> str:
+    os.makedirs(data_dir, exist_ok=True)
+    path = collection_path(data_dir, rows, years, seed)
+    if not os.path.exists(path):
+        generate_collection(path, rows, years, seed)
+    return path
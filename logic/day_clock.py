@@ -0,0 +1,77 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+
+def rollover_from_cutoff(cutoff_timestamp: int) -> timedelta:
+    # Anki's day starts at the same local time every day; day_cutoff is the
+    # next occurrence of it.
+    cutoff = datetime.fromtimestamp(cutoff_timestamp)
+    return timedelta(hours=cutoff.hour, minutes=cutoff.minute, seconds=cutoff.second)
+
+
+def day_of_timestamp(timestamp: float, rollover: timedelta) -> date:
+    # Local wall-clock time minus the rollover, so a review an hour after the
+    # rollover belongs to the new day even when DST moved the clocks that
+    # night.
+    return (datetime.fromtimestamp(timestamp) - rollover).date()
+
+
+def day_bounds(day: date, rollover: timedelta) -> Tuple[int, int]:
+    # [start, end) of an Anki day as Unix timestamps. Both ends are taken at
+    # the local rollover time, so DST days are 23 or 25 hours long.
+    start = datetime.combine(day, datetime.min.time()) + rollover
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time()) + rollover
+    return int(start.timestamp()), int(end.timestamp())
+
+
+# Today's Anki day, cached until its end. The scheduler's day_cutoff is read
+# once per day (or after invalidate()); every other call is a clock read and
+# a comparison.
+class DayClock:
+    def __init__(self, get_cutoff: Callable[[], int]):
+        self._get_cutoff = get_cutoff
+        self.rollover = timedelta(0)
+        self._today: Optional[date] = None
+        self._today_key: Optional[str] = None
+        self._day_start = 0
+        self._day_end = 0
+
+    def invalidate(self):
+        # For when the rollover hour may have changed (profile open, sync).
+        self._today = None
+
+    def _refresh(self):
+        cutoff = self._get_cutoff()
+        self.rollover = rollover_from_cutoff(cutoff)
+        # day_cutoff is the end of the current day.
+        today = datetime.fromtimestamp(cutoff).date() - timedelta(days=1)
+        self._day_start = day_bounds(today, self.rollover)[0]
+        self._day_end = cutoff
+        self._today = today
+        self._today_key = today.strftime("%Y-%m-%d")
+
+    def _ensure_current(self):
+        if self._today is None or time.time() >= self._day_end:
+            self._refresh()
+
+    def today(self) -> date:
+        self._ensure_current()
+        return self._today
+
+    def today_ordinal(self) -> int:
+        return self.today().toordinal()
+
+    def today_key(self) -> str:
+        self._ensure_current()
+        return self._today_key
+
+    def next_rollover(self) -> int:
+        self._ensure_current()
+        return self._day_end
+
+    def day_bounds(self, day: date) -> Tuple[int, int]:
+        self._ensure_current()
+        if day == self._today:
+            return self._day_start, self._day_end
+        return day_bounds(day, self.rollover)
@@ -0,0 +1,105 @@
+import bisect
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .day_clock import day_bounds, day_of_timestamp
+
+# Revlog rows are grouped in SQLite by quarter-hour of review time,
+# id / 1000 / BUCKET_SECONDS. Every UTC offset in use is a multiple of 15
+# minutes and the rollover is a whole local hour, so the start of an Anki day
+# always falls on a bucket boundary and a bucket never spans two days.
+BUCKET_SECONDS = 15 * 60
+
+# Per-day states returned by DayIndex.day_states. A reviewed day wins over a
+# freeze covering the same day, as in the month calendar.
+DAY_FROZEN = 1
+DAY_REVIEWED = 2
+
+
+def parse_day_key(date_str: str) -> int:
+    year, month, day = date_str.split("-")
+    return date(int(year), int(month), int(day)).toordinal()
+
+
+def format_day_key(ordinal: int) -> str:
+    return date.fromordinal(ordinal).strftime("%Y-%m-%d")
+
+
+def bucket_day_ordinals(buckets: Iterable[int], rollover: timedelta) -> Iterator[Tuple[int, int]]:
+    # Yields (bucket, Anki day ordinal) for buckets in ascending order. Only
+    # the first bucket of each day is converted; the rest reuse its result.
+    ordinal = None
+    day_end_ts = None
+    for bucket in buckets:
+        bucket_ts = bucket * BUCKET_SECONDS
+        if day_end_ts is None or bucket_ts >= day_end_ts:
+            day = day_of_timestamp(bucket_ts, rollover)
+            ordinal = day.toordinal()
+            day_end_ts = day_bounds(day, rollover)[1]
+        yield bucket, ordinal
+
+
+# Sorted arrays of reviewed and frozen day ordinals. A day counts towards the
+# streak if it was reviewed or covered by a freeze, so the merged `active`
+# days are also stored as runs, making every streak lookup one bisect.
+class DayIndex:
+    def __init__(self, reviewed_days: Iterable[int] = (), frozen_days: Iterable[int] = ()):
+        reviewed = set(reviewed_days)
+        frozen = set(frozen_days)
+        self.reviewed: List[int] = sorted(reviewed)
+        self.frozen: List[int] = sorted(frozen)
+        self.active: List[int] = sorted(reviewed | frozen)
+
+        # Contiguous active runs as inclusive (start, end) intervals.
+        self.runs: List[Tuple[int, int]] = []
+        for ordinal in self.active:
+            if self.runs and self.runs[-1][1] == ordinal - 1:
+                self.runs[-1] = (self.runs[-1][0], ordinal)
+            else:
+                self.runs.append((ordinal, ordinal))
+        self._run_starts = [start for start, _ in self.runs]
+        self._longest = max((end - start + 1 for start, end in self.runs), default=0)
+
+    @staticmethod
+    def _contains(days: List[int], ordinal: int) -> bool:
+        i = bisect.bisect_left(days, ordinal)
+        return i < len(days) and days[i] == ordinal
+
+    def is_reviewed(self, ordinal: int) -> bool:
+        return self._contains(self.reviewed, ordinal)
+
+    def is_frozen(self, ordinal: int) -> bool:
+        return self._contains(self.frozen, ordinal)
+
+    def is_active(self, ordinal: int) -> bool:
+        return self._contains(self.active, ordinal)
+
+    def last_active_before(self, ordinal: int) -> Optional[int]:
+        i = bisect.bisect_left(self.active, ordinal)
+        return self.active[i - 1] if i > 0 else None
+
+    def run_containing(self, ordinal: int) -> Optional[Tuple[int, int]]:
+        i = bisect.bisect_right(self._run_starts, ordinal) - 1
+        if i >= 0 and ordinal <= self.runs[i][1]:
+            return self.runs[i]
+        return None
+
+    def streak_ending_at(self, ordinal: int) -> int:
+        # Length of the streak as it stood on `ordinal`: the part of its run
+        # up to and including that day.
+        run = self.run_containing(ordinal)
+        return ordinal - run[0] + 1 if run else 0
+
+    def longest_streak(self) -> int:
+        return self._longest
+
+    def day_states(self, first: int, last: int) -> bytearray:
+        # One byte per day in [first, last]: DAY_REVIEWED, DAY_FROZEN or 0.
+        # Only the days inside the range are visited, via two bisects per list.
+        states = bytearray(max(0, last - first + 1))
+        for days, state in ((self.frozen, DAY_FROZEN), (self.reviewed, DAY_REVIEWED)):
+            lo = bisect.bisect_left(days, first)
+            hi = bisect.bisect_right(days, last)
+            for ordinal in days[lo:hi]:
+                states[ordinal - first] = state
+        return states
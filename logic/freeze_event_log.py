@@ -0,0 +1,46 @@
+import json
+import os
+import re
+from typing import List, Optional
+
+
+# Every freeze event recorded on this device, one JSON array per line, in the
+# add-on folder next to the day history. The collection config only carries
+# the ledger's snapshot and latest events, so the full history is kept here,
+# outside of what gets synced. Events recorded on another device reach this
+# one only through the synced snapshot.
+class FreezeEventLog:
+    def __init__(self, addon_dir: str, profile_name: str):
+        safe_name = re.sub(r"[^\w-]", "_", profile_name)
+        self.path = os.path.join(addon_dir, f"freeze_history_{safe_name}.jsonl")
+        self._events: Optional[List[list]] = None
+
+    def read(self) -> List[list]:
+        # Read once, then kept in step with append.
+        if self._events is None:
+            events = []
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, "r") as f:
+                        for line in f:
+                            try:
+                                events.append(json.loads(line))
+                            except ValueError:
+                                # A torn line from a crash mid-append.
+                                continue
+            except OSError as e:
+                print(f"AnkiStreak: Error reading freeze history from {self.path}: {e}")
+            self._events = events
+        return self._events
+
+    def append(self, events: List[list]):
+        if not events:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events))
+        except OSError as e:
+            print(f"AnkiStreak: Error saving freeze history to {self.path}: {e}")
+        if self._events is not None:
+            self._events.extend(events)
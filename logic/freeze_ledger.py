@@ -0,0 +1,236 @@
+import bisect
+from typing import Iterable, List, Optional, Set
+
+from .day_index import format_day_key, parse_day_key
+
+# Freeze state is event-sourced. The config keeps a snapshot of the state
+# and the events recorded since it; loading replays only those. Once
+# SNAPSHOT_INTERVAL events have piled up they are folded into a new snapshot,
+# so the synced ledger stays small. Every event is also handed to the owner
+# through take_unlogged() for the full local history (see freeze_event_log).
+#
+#   ["earn", day, run_start]     a freeze earned on `day`, a milestone of the
+#                                streak run that started on `run_start`
+#   ["grant", day]               a freeze given outside of any streak run
+#   ["forfeit", day, run_start]  a milestone reached while already holding
+#                                the maximum number of freezes
+#   ["consume", day]             the oldest eligible freeze covered `day`
+#   ["adopt", run_start, count]  milestones of a run credited without
+#                                freezes, when taking over pre-ledger data
+#   ["rebase", earned, consumed] state reset to the given ordinals
+#
+# Days are date ordinals. earned_freeze_dates / consumed_freeze_dates are
+# still written for older versions of the add-on.
+LEDGER_KEY = "freeze_ledger"
+SNAPSHOT_INTERVAL = 32
+
+
+class FreezeLedger:
+    def __init__(self, earned: Iterable[int] = (), consumed: Iterable[int] = ()):
+        self.earned: List[int] = sorted(earned)
+        self.consumed: Set[int] = set(consumed)
+        # The streak run milestones were last credited for, and how many.
+        self.run_start: Optional[int] = None
+        self.credited = 0
+        # Events since the snapshot, oldest first.
+        self.events: List[list] = []
+        # Events not yet written to the local history.
+        self.unlogged: List[list] = []
+        self.snapshot = self._snapshot_state(0)
+        self.version = 0
+        # Set when the stored ledger could not be read; the owner should
+        # rebuild it from the review history.
+        self.needs_rebuild = False
+
+    # Loading and storing
+
+    @classmethod
+    def from_data(cls, data: dict) -> "FreezeLedger":
+        earned = [parse_day_key(date_str) for date_str in data.get("earned_freeze_dates", [])]
+        consumed = [parse_day_key(date_str) for date_str in data.get("consumed_freeze_dates", [])]
+
+        stored = data.get(LEDGER_KEY)
+        if stored is None:
+            # First run with the ledger: the lists become its starting state.
+            return cls(earned, consumed)
+
+        ledger = cls()
+        try:
+            ledger._restore_snapshot(stored["snapshot"])
+            ledger.events = [list(event) for event in stored["events"]]
+            for event in ledger.events:
+                ledger._apply(event)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            print(f"AnkiStreak: Freeze ledger unreadable, it will be rebuilt: {e}")
+            ledger = cls(earned, consumed)
+            ledger.needs_rebuild = True
+            return ledger
+
+        if ledger.earned != sorted(earned) or ledger.consumed != set(consumed):
+            # The lists were changed without the ledger, e.g. by an older
+            # version of the add-on on another device. They win.
+            ledger._record(["rebase", sorted(earned), sorted(consumed)])
+        return ledger
+
+    def store(self, data: dict):
+        data[LEDGER_KEY] = {"snapshot": self.snapshot, "events": list(self.events)}
+        data["earned_freeze_dates"] = [format_day_key(ordinal) for ordinal in self.earned]
+        data["consumed_freeze_dates"] = [format_day_key(ordinal) for ordinal in sorted(self.consumed)]
+
+    def _snapshot_state(self, events_folded: int) -> dict:
+        return {
+            # Events recorded over the ledger's lifetime, up to this snapshot.
+            "events_folded": events_folded,
+            "earned": list(self.earned),
+            "consumed": sorted(self.consumed),
+            "run_start": self.run_start,
+            "credited": self.credited,
+        }
+
+    def _restore_snapshot(self, snapshot: dict):
+        if int(snapshot["events_folded"]) < 0:
+            raise ValueError("negative event count in snapshot")
+        self.earned = sorted(int(ordinal) for ordinal in snapshot["earned"])
+        self.consumed = {int(ordinal) for ordinal in snapshot["consumed"]}
+        self.run_start = snapshot["run_start"]
+        self.credited = int(snapshot["credited"])
+        self.snapshot = snapshot
+
+    # Events
+
+    def _apply(self, event: list):
+        kind = event[0]
+        if kind in ("earn", "forfeit"):
+            day, run_start = event[1], event[2]
+            if run_start != self.run_start:
+                self.run_start = run_start
+                self.credited = 0
+            self.credited += 1
+            if kind == "earn":
+                bisect.insort(self.earned, day)
+        elif kind == "grant":
+            bisect.insort(self.earned, event[1])
+        elif kind == "consume":
+            self.earned.pop(0)
+            self.consumed.add(event[1])
+        elif kind == "adopt":
+            self.run_start, self.credited = event[1], event[2]
+        elif kind == "rebase":
+            self.earned = sorted(event[1])
+            self.consumed = set(event[2])
+        else:
+            raise ValueError(f"unknown freeze event {kind!r}")
+        self.version += 1
+
+    def _take_snapshot(self):
+        self.snapshot = self._snapshot_state(self.snapshot["events_folded"] + len(self.events))
+        self.events = []
+
+    def _record(self, event: list):
+        self._apply(event)
+        self.events.append(event)
+        self.unlogged.append(event)
+        if len(self.events) >= SNAPSHOT_INTERVAL:
+            self._take_snapshot()
+
+    # Reads
+
+    def available(self) -> int:
+        return len(self.earned)
+
+    def take_unlogged(self) -> List[list]:
+        events, self.unlogged = self.unlogged, []
+        return events
+
+    # Changes
+
+    def earn(self, ordinal: int, count: int, limit: int) -> int:
+        added = max(0, min(count, limit - len(self.earned)))
+        for _ in range(added):
+            self._record(["grant", ordinal])
+        return added
+
+    def adopt_run(self, run_start: int, streak: int, days_per_freeze: int, limit: int) -> int:
+        # Takes over the current run from data written before the ledger,
+        # when freezes were inferred from the streak: anything that
+        # inference still owed is granted once, then the run's milestones so
+        # far count as credited.
+        milestones = streak // days_per_freeze
+        owed = milestones - len(self.consumed) - len(self.earned)
+        added = self.earn(run_start + streak - 1, owed, limit)
+        self._record(["adopt", run_start, milestones])
+        return added
+
+    def credit_run(self, run_start: int, streak: int, days_per_freeze: int, limit: int) -> int:
+        # Credits every milestone of the run not credited yet, one freeze
+        # per `days_per_freeze` days, dated to the day it was reached.
+        # Milestones reached while holding `limit` freezes are forfeited.
+        # Returns the number of freezes earned.
+        already = self.credited if run_start == self.run_start else 0
+        earned = 0
+        for milestone in range(already + 1, streak // days_per_freeze + 1):
+            day = run_start + milestone * days_per_freeze - 1
+            if len(self.earned) < limit:
+                self._record(["earn", day, run_start])
+                earned += 1
+            else:
+                self._record(["forfeit", day, run_start])
+        return earned
+
+    def trim(self, limit: int):
+        # Keeps the most recently earned freezes.
+        if len(self.earned) > limit:
+            self._record(["rebase", self.earned[len(self.earned) - limit:], sorted(self.consumed)])
+
+    def cover_gap(self, first: int, last: int) -> bool:
+        # Covers every day in [first, last], none of which may be covered
+        # already, with a freeze earned on or before that day. The oldest
+        # eligible freezes go first. Either the whole gap is covered or
+        # nothing is consumed; a gap longer than the freezes on hand fails
+        # without looking at it, anything else is one pass.
+        gap = last - first + 1
+        if gap <= 0:
+            return True
+        if gap > len(self.earned):
+            return False
+
+        # Days and freezes both ascend, so day i takes freeze i; if that one
+        # is too new, fewer than i + 1 freezes predate the day.
+        for offset in range(gap):
+            if self.earned[offset] > first + offset:
+                return False
+
+        for day in range(first, last + 1):
+            self._record(["consume", day])
+        return True
+
+    # Rebuilding
+
+    @classmethod
+    def rebuild(cls, reviewed_days: Iterable[int], today_ordinal: int,
+                days_per_freeze: int, limit: int) -> "FreezeLedger":
+        # Replays the review history day by day, as the add-on would have
+        # seen it: milestones earn freezes, and each gap before a reviewed
+        # day (or before today) is covered if the freezes allow.
+        ledger = cls()
+        run_start = None
+        last_active = None
+
+        def close_gap(next_day: int) -> bool:
+            return last_active is not None and ledger.cover_gap(last_active + 1, next_day - 1)
+
+        for day in sorted(set(reviewed_days)):
+            if day >= today_ordinal:
+                break
+            if last_active is None or (day > last_active + 1 and not close_gap(day)):
+                run_start = day
+            last_active = day
+            ledger.credit_run(run_start, day - run_start + 1, days_per_freeze, limit)
+
+        if last_active is not None and last_active < today_ordinal - 1 and close_gap(today_ordinal):
+            ledger.credit_run(run_start, today_ordinal - run_start, days_per_freeze, limit)
+        # The replayed events are a reconstruction, not a record; only the
+        # resulting state is kept, and the history notes the reset.
+        ledger._take_snapshot()
+        ledger.unlogged = [["rebase", list(ledger.earned), sorted(ledger.consumed)]]
+        return ledger
@@ -0,0 +1,127 @@
+import os
+import struct
+from datetime import date
+from typing import Iterable, Set
+
+# On-disk layout for the reviewed-day history.
+#
+# streak_history.bin  snapshot: header (magic, version, first ordinal, day
+#                     count) followed by a bitmap with one bit per day.
+# streak_history.log  journal: one little-endian uint32 ordinal per day added
+#                     since the snapshot was written.
+#
+# Snapshots are written to a temporary file and swapped in with os.replace, so
+# a crash leaves either the old or the new snapshot. Replaying the journal on
+# top of a snapshot that already contains its days is harmless. Files that do
+# not decode are renamed to *.corrupt rather than written over.
+
+SNAPSHOT_MAGIC = b"ASTH"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sBII")
+JOURNAL_RECORD = struct.Struct("<I")
+CORRUPT_SUFFIX = ".corrupt"
+# Days outside this range cannot come from a review log.
+MIN_ORDINAL = date(1990, 1, 1).toordinal()
+MAX_ORDINAL = date(2200, 1, 1).toordinal()
+
+
+def atomic_write(path: str, payload: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def encode_day_bitmap(days: Iterable[int]) -> bytes:
+    ordinals = sorted(days)
+    if not ordinals:
+        return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, 0)
+
+    first = ordinals[0]
+    count = ordinals[-1] - first + 1
+    bitmap = bytearray((count + 7) // 8)
+    for ordinal in ordinals:
+        offset = ordinal - first
+        bitmap[offset >> 3] |= 1 << (offset & 7)
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, first, count) + bytes(bitmap)
+
+
+def decode_day_bitmap(payload: bytes) -> Set[int]:
+    magic, version, first, count = SNAPSHOT_HEADER.unpack_from(payload)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("not a streak history snapshot")
+    if count and not (MIN_ORDINAL <= first and first + count <= MAX_ORDINAL):
+        raise ValueError("streak history snapshot out of range")
+
+    bitmap = payload[SNAPSHOT_HEADER.size:]
+    if len(bitmap) != (count + 7) // 8:
+        raise ValueError("streak history snapshot has the wrong length")
+    if count % 8 and bitmap[-1] >> (count % 8):
+        raise ValueError("streak history snapshot has days past its end")
+
+    days = set()
+    for byte_index, byte in enumerate(bitmap):
+        while byte:
+            low_bit = byte & -byte
+            days.add(first + (byte_index << 3) + low_bit.bit_length() - 1)
+            byte ^= low_bit
+    return days
+
+
+class DayHistoryStore:
+    SNAPSHOT_SUFFIX = ".bin"
+    JOURNAL_SUFFIX = ".log"
+    # Fold the journal back into the snapshot once it holds this many days.
+    MAX_JOURNAL_RECORDS = 64
+
+    def __init__(self, base_path: str):
+        self.snapshot_path = base_path + self.SNAPSHOT_SUFFIX
+        self.journal_path = base_path + self.JOURNAL_SUFFIX
+        self.journal_records = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_path)
+
+    def load(self) -> Set[int]:
+        days = set()
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                days = decode_day_bitmap(f.read())
+
+        self.journal_records = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                journal = f.read()
+            # A torn final record from a crash mid-append is ignored.
+            usable = len(journal) - len(journal) % JOURNAL_RECORD.size
+            for (ordinal,) in JOURNAL_RECORD.iter_unpack(journal[:usable]):
+                if not MIN_ORDINAL <= ordinal < MAX_ORDINAL:
+                    raise ValueError("streak history journal out of range")
+                days.add(ordinal)
+            self.journal_records = usable // JOURNAL_RECORD.size
+        return days
+
+    def append(self, ordinal: int):
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "ab") as f:
+            f.write(JOURNAL_RECORD.pack(ordinal))
+        self.journal_records += 1
+
+    def needs_compaction(self) -> bool:
+        return self.journal_records >= self.MAX_JOURNAL_RECORDS
+
+    def write_snapshot(self, days: Iterable[int]):
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        atomic_write(self.snapshot_path, encode_day_bitmap(days))
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_records = 0
+
+    def move_aside(self):
+        # Keeps unreadable files for inspection; the next write starts anew.
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                os.replace(path, path + CORRUPT_SUFFIX)
+        self.journal_records = 0
@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class DayReviewStats:
+    def __init__(self):
+        self.reviews = 0
+        self.time_spent_ms = 0
+        # deck name -> {"reviews": int, "time_spent_ms": int}
+        self.decks: Dict[str, dict] = {}
+
+    def add(self, deck_name: Optional[str], reviews: int, time_spent_ms: int):
+        self.reviews += reviews
+        self.time_spent_ms += time_spent_ms
+        # Reviews of deleted cards count towards the totals only.
+        if deck_name is None:
+            return
+        deck = self.decks.setdefault(deck_name, {"reviews": 0, "time_spent_ms": 0})
+        deck["reviews"] += reviews
+        deck["time_spent_ms"] += time_spent_ms
+
+    def as_details(self) -> dict:
+        # Same order as the decks table's case-insensitive collation.
+        return {name: dict(self.decks[name]) for name in sorted(self.decks, key=str.casefold)}
+
+
+class ReviewStatsCache:
+    def __init__(self):
+        self._days: Dict[int, DayReviewStats] = {}
+        # (year, month) -> (first ordinal, last ordinal, {ordinal: [reviews, time_spent_ms]})
+        self._months: Dict[Tuple[int, int], Tuple[int, int, Dict[int, List[int]]]] = {}
+        # Bumped whenever any cached month's totals change.
+        self.months_version = 0
+        # (year, month) -> value of months_version when that month last changed
+        self._month_versions: Dict[Tuple[int, int], int] = {}
+
+    def get(self, ordinal: int) -> Optional[DayReviewStats]:
+        return self._days.get(ordinal)
+
+    def put(self, ordinal: int, stats: DayReviewStats):
+        self._days[ordinal] = stats
+
+    def get_month(self, year: int, month: int) -> Optional[Dict[int, List[int]]]:
+        entry = self._months.get((year, month))
+        return entry[2] if entry else None
+
+    def month_version(self, year: int, month: int) -> int:
+        # Changes whenever this month's cached totals do; 0 while uncached.
+        return self._month_versions.get((year, month), 0)
+
+    def _month_changed(self, key: Tuple[int, int]):
+        self.months_version += 1
+        self._month_versions[key] = self.months_version
+
+    def put_month(self, year: int, month: int, first_ordinal: int, last_ordinal: int,
+                  totals: Dict[int, List[int]]):
+        self._months[(year, month)] = (first_ordinal, last_ordinal, totals)
+        self._month_changed((year, month))
+
+    def add_review(self, ordinal: int, time_spent_ms: int):
+        for key, (first, last, totals) in self._months.items():
+            if first <= ordinal <= last:
+                day_totals = totals.setdefault(ordinal, [0, 0])
+                day_totals[0] += 1
+                day_totals[1] += time_spent_ms
+                self._month_changed(key)
+
+    def invalidate(self, first_ordinal: int, last_ordinal: int = None):
+        def overlaps(start, end):
+            return end >= first_ordinal and (last_ordinal is None or start <= last_ordinal)
+
+        for ordinal in list(self._days):
+            if overlaps(ordinal, ordinal):
+                del self._days[ordinal]
+        for key, (start, end, _) in list(self._months.items()):
+            if overlaps(start, end):
+                del self._months[key]
+                del self._month_versions[key]
+                self.months_version += 1
+
+    def clear(self):
+        self._days.clear()
+        self._months.clear()
+        self._month_versions.clear()
+        self.months_version += 1
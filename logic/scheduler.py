@@ -0,0 +1,77 @@
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Tuple
+
+from aqt.qt import QTimer
+
+# Jobs are due at wall-clock times, but a QTimer measures elapsed time and
+# may not count time spent asleep. Never wait longer than this before looking
+# at the clock again.
+MAX_WAIT_MS = 15 * 60 * 1000
+
+
+# One single-shot QTimer for all of the add-on's deferred work. Jobs are kept
+# in a heap by due time and identified by name; scheduling a name again
+# replaces the earlier job.
+class Scheduler:
+    def __init__(self, parent=None):
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_due_jobs)
+        self._heap: List[Tuple[float, int, str]] = []
+        # name -> (sequence number of the live heap entry, callback)
+        self._jobs: Dict[str, Tuple[int, Callable[[], None]]] = {}
+        self._sequence = itertools.count()
+
+    def schedule_at(self, name: str, due_timestamp: float, callback: Callable[[], None]):
+        sequence = next(self._sequence)
+        self._jobs[name] = (sequence, callback)
+        heapq.heappush(self._heap, (due_timestamp, sequence, name))
+        self._arm()
+
+    def schedule_in(self, name: str, delay_ms: int, callback: Callable[[], None]):
+        self.schedule_at(name, time.time() + delay_ms / 1000, callback)
+
+    def is_scheduled(self, name: str) -> bool:
+        return name in self._jobs
+
+    def cancel(self, name: str):
+        # The heap entry is dropped lazily when it reaches the top.
+        if self._jobs.pop(name, None) is not None:
+            self._arm()
+
+    def _discard_stale(self):
+        while self._heap:
+            _, sequence, name = self._heap[0]
+            job = self._jobs.get(name)
+            if job is not None and job[0] == sequence:
+                return
+            heapq.heappop(self._heap)
+
+    def _arm(self):
+        self._discard_stale()
+        if not self._heap:
+            self._timer.stop()
+            return
+        wait_ms = int((self._heap[0][0] - time.time()) * 1000)
+        self._timer.start(max(0, min(wait_ms, MAX_WAIT_MS)))
+
+    def _run_due_jobs(self):
+        now = time.time()
+        due = []
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, name = heapq.heappop(self._heap)
+            job = self._jobs.get(name)
+            if job is not None and job[0] == sequence:
+                del self._jobs[name]
+                due.append((name, job[1]))
+            self._discard_stale()
+
+        for name, callback in due:
+            try:
+                callback()
+            except Exception as e:
+                print(f"AnkiStreak: Error running scheduled job '{name}': {e}")
+        self._arm()
@@ -1,67 +1,163 @@
 import os
 import json
-from datetime import datetime
-from aqt import mw, gui_hooks
-from typing import Set
+from datetime import timedelta
+from aqt import mw
+from typing import Set, Tuple
+from .day_clock import rollover_from_cutoff
+from .day_index import BUCKET_SECONDS, bucket_day_ordinals, parse_day_key, format_day_key
+from .history_store import DayHistoryStore, atomic_write
 
 class StreakHistoryManager:
-    FILENAME = "streak_history.json"
+    FILENAME = "streak_history"
+    LEGACY_FILENAME = "streak_history.json"
+    META_FILENAME = "streak_history_meta.json"
 
     def __init__(self):
-        self.path = os.path.join(mw.pm.addonFolder(), "addon", self.FILENAME)
+        addon_dir = os.path.join(mw.pm.addonFolder(), "addon")
+        self.addon_dir = addon_dir
+        self.store = DayHistoryStore(os.path.join(addon_dir, self.FILENAME))
+        self.legacy_path = os.path.join(addon_dir, self.LEGACY_FILENAME)
+        self.meta_path = os.path.join(addon_dir, self.META_FILENAME)
         self.days = set()
+        self.version = 0
+        self._saved_version = 0
+        self._day_keys = None
+        self.meta = {"last_revlog_id": {}}
         self.load()
 
-        gui_hooks.profile_did_open.append(self._on_profile_open)
-
-    def _on_profile_open(self):
-        self.import_reviewed_days_from_log()
-        self.save()
+    def _migrate_legacy_json(self):
+        with open(self.legacy_path, "r") as f:
+            days = {parse_day_key(date_str) for date_str in json.load(f)}
+        self.store.write_snapshot(days)
+        os.replace(self.legacy_path, self.legacy_path + ".bak")
+        print(f"[StreakHistory] Migrated {len(days)} day(s) from {self.LEGACY_FILENAME}.")
 
     def load(self):
+        loaded = False
         try:
-            if os.path.exists(self.path):
-                with open(self.path, "r") as f:
-                    self.days = set(json.load(f))
+            if not self.store.exists() and os.path.exists(self.legacy_path):
+                self._migrate_legacy_json()
+            loaded = self.store.exists()
+            self.days = self.store.load()
         except Exception as e:
-            print(f"Error loading streak history from {self.path}: {e}")
+            print(f"Error loading streak history from {self.store.snapshot_path}: {e}")
+            loaded = False
             self.days = set()
+            try:
+                self.store.move_aside()
+            except Exception as e:
+                print(f"Error moving unreadable streak history aside: {e}")
+        self._mark_changed()
+        self._saved_version = self.version
+
+        try:
+            if os.path.exists(self.meta_path):
+                with open(self.meta_path, "r") as f:
+                    self.meta = json.load(f)
+            self.meta.setdefault("last_revlog_id", {})
+        except Exception as e:
+            print(f"Error loading streak history metadata from {self.meta_path}: {e}")
+            self.meta = {"last_revlog_id": {}}
+
+        if not loaded and self.meta["last_revlog_id"]:
+            # The import positions only hold for the days they were imported
+            # into; without those, every profile rescans its whole review log.
+            print("[StreakHistory] No usable history on disk, the review log will be rescanned.")
+            self.meta["last_revlog_id"] = {}
 
     def save(self):
+        # Folds the journal into a fresh snapshot. Days added in between are
+        # already on disk through the journal.
+        if self.version != self._saved_version or self.store.journal_records:
+            try:
+                self.store.write_snapshot(self.days)
+                self._saved_version = self.version
+            except Exception as e:
+                print(f"Error saving streak history to {self.store.snapshot_path}: {e}")
+
         try:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
-            with open(self.path, "w") as f:
-                json.dump(sorted(list(self.days)), f)
+            atomic_write(self.meta_path, json.dumps(self.meta).encode("utf-8"))
         except Exception as e:
-            print(f"Error saving streak history to {self.path}: {e}")
+            print(f"Error saving streak history metadata to {self.meta_path}: {e}")
+
+    def _mark_changed(self):
+        self.version += 1
+        self._day_keys = None
 
     def add_day(self, date_str: str):
-        if date_str not in self.days:
-            self.days.add(date_str)
+        self.add_day_ordinal(parse_day_key(date_str))
+
+    def add_day_ordinal(self, ordinal: int):
+        if ordinal in self.days:
+            return
+        self.days.add(ordinal)
+        self._mark_changed()
+        try:
+            self.store.append(ordinal)
+            self._saved_version = self.version
+        except Exception as e:
+            print(f"Error saving streak history to {self.store.journal_path}: {e}")
+        if self.store.needs_compaction():
             self.save()
 
-    def import_reviewed_days_from_log(self):
+    def profile_key(self) -> str:
+        # The history file lives in the shared add-on folder, so the import
+        # position has to be tracked per profile.
+        return getattr(mw.pm, "name", None) or "default"
+
+    def get_last_imported_revlog_id(self) -> int:
+        return self.meta["last_revlog_id"].get(self.profile_key(), 0)
+
+    def _set_last_imported_revlog_id(self, revlog_id: int):
+        self.meta["last_revlog_id"][self.profile_key()] = revlog_id
+
+    def import_reviewed_days_from_log(self, lookback_days: int = 0):
         if not mw.col:
             print("AnkiStreak: Collection not available for revlog import (unexpected).")
             return
 
-        result = mw.col.db.all("SELECT id FROM revlog")
-        current_days_count = len(self.days)
+        days, max_id = self.scan_revlog(mw.col, self.get_last_imported_revlog_id(), lookback_days)
+        self.merge_imported_days(days, max_id)
 
-        for revlog_id, in result:           
-            ts = revlog_id / 1000            
-            cutoff_timestamp = mw.col.sched.day_cutoff 
-            cutoff_datetime = datetime.fromtimestamp(cutoff_timestamp)
-            offset_seconds = cutoff_datetime.hour * 3600 + cutoff_datetime.minute * 60 + cutoff_datetime.second          
-            date_obj = datetime.fromtimestamp(ts - offset_seconds)
-            date_str = date_obj.strftime("%Y-%m-%d")
-          
-            if date_str not in self.days:
-                self.days.add(date_str)
+    def scan_revlog(self, col, last_id: int, lookback_days: int = 0) -> Tuple[Set[int], int]:
+        # Reads the collection only, so it can run on a background thread;
+        # merge_imported_days applies the result on the main thread.
+        max_id = col.db.scalar("SELECT max(id) FROM revlog") or 0
+
+        if max_id < last_id:
+            # Revlog ids only grow, so a smaller maximum means the collection
+            # was swapped out underneath us.
+            print("[StreakHistory] Review log is older than the last import, rebuilding history.")
+            last_id = 0
+        elif last_id and lookback_days:
+            # Reviews synced from another device keep their original ids,
+            # which may be older than the last imported one.
+            last_id = max(0, last_id - lookback_days * 86400 * 1000)
+
+        rollover = rollover_from_cutoff(col.sched.day_cutoff)
+        return self._reviewed_days_since(col, last_id, rollover), max_id
+
+    def merge_imported_days(self, days: Set[int], max_id: int):
+        current_days_count = len(self.days)
+        self.days.update(days)
+        self._set_last_imported_revlog_id(max_id)
 
         added = len(self.days) - current_days_count
         if added > 0:
-            print(f"[StreakHistory] Added {len(self.days) - current_days_count} new day(s) from review log.")
+            self._mark_changed()
+            print(f"[StreakHistory] Added {added} new day(s) from review log.")
 
-    def get_streak_days(self) -> Set[str]:
+    def _reviewed_days_since(self, col, last_id: int, rollover: timedelta) -> Set[int]:
+        buckets = col.db.list(
+            "SELECT DISTINCT id / 1000 / ? AS bucket FROM revlog WHERE id > ? ORDER BY bucket",
+            BUCKET_SECONDS, last_id
+        )
+        return {ordinal for _, ordinal in bucket_day_ordinals(buckets, rollover)}
+
+    def get_day_ordinals(self) -> Set[int]:
         return self.days
+
+    def get_streak_days(self) -> Set[str]:
+        if self._day_keys is None:
+            self._day_keys = {format_day_key(ordinal) for ordinal in self.days}
+        return self._day_keys
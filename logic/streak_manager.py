@@ -1,11 +1,27 @@
-from datetime import datetime, timedelta, date
+from datetime import date
 from aqt import mw, gui_hooks, AnkiQt
+from aqt.operations import QueryOp
 from .streak_history_manager import StreakHistoryManager
-from typing import Union, Any, List
+from .day_clock import DayClock
+from .freeze_ledger import FreezeLedger
+from .freeze_event_log import FreezeEventLog
+from .scheduler import Scheduler
+from .day_index import BUCKET_SECONDS, DayIndex, bucket_day_ordinals, parse_day_key, format_day_key
+from .review_stats import DayReviewStats, ReviewStatsCache
+from typing import Union, Any, Dict, List
+import calendar
+import json
 import time
 
 MAX_STREAK_FREEZES = 2
 DAYS_PER_FREEZE = 5
+SYNC_LOOKBACK_DAYS = 30
+SAVE_DELAY_MS = 3000
+# Run the rollover job just after the cutoff, so the new day has begun.
+ROLLOVER_GRACE_SECONDS = 1
+
+FLUSH_JOB = "flush_data"
+ROLLOVER_JOB = "day_rollover"
 
 class StreakManager:
     _instance = None
@@ -22,14 +38,148 @@ class StreakManager:
         self.MAX_STREAK_FREEZES = MAX_STREAK_FREEZES
         self.DAYS_PER_FREEZE = DAYS_PER_FREEZE
         self.streak_history = StreakHistoryManager()
+        self.review_stats = ReviewStatsCache()
+        self.day_clock = DayClock(lambda: self.mw.col.sched.day_cutoff)
         self.data = None
+        self.freeze_ledger = FreezeLedger()
+        self.freeze_log = None
+        # Bumped on every change to `data`; see get_state_version.
+        self._data_version = 0
+        self._recalculated_day = None
+        self._day_index = None
+        self._day_index_key = None
+        self._day_index_version = 0
+        self._toolbar_state = None
+        self._last_saved_data = None
+        self.scheduler = Scheduler(self.mw)
+        self._toolbar_suspended = False
+        self.history_ready = True
+        self._sync_pending = False
+        self.startup_timings = {}
+
+        gui_hooks.profile_will_close.append(self._on_profile_will_close)
+        gui_hooks.sync_will_start.append(self.flush_data)
+        gui_hooks.state_did_undo.append(self._on_undo)
+
+    def run_startup(self):
+        # The one profile-open path: load state, import new revlog days,
+        # recompute, then render the toolbar once. The revlog scan runs in the
+        # background; until it finishes the toolbar shows a loading state.
+        # Timings are in ms.
+        if not (self.mw and self.mw.col):
+            return
+
+        timings = {}
+        phase_start = time.perf_counter()
+
+        def end_phase(name):
+            nonlocal phase_start
+            now = time.perf_counter()
+            timings[name] = (now - phase_start) * 1000
+            phase_start = now
+
+        self.day_clock.invalidate()
+        self._load_state()
+        self._data_version += 1
+        self._recalculated_day = None
+        self.review_stats.clear()
+        self.history_ready = False
+        self._render_loading_toolbar()
+        end_phase("load")
+
+        last_id = self.streak_history.get_last_imported_revlog_id()
+
+        def on_scanned(result):
+            days, max_id = result
+            self.streak_history.merge_imported_days(days, max_id)
+            self.streak_history.save()
+            end_phase("import")
+            self._finish_startup(timings, end_phase)
+
+        def on_failed(error):
+            print(f"AnkiStreak: Error importing review history: {error}")
+            end_phase("import")
+            self._finish_startup(timings, end_phase)
+
+        QueryOp(
+            parent=self.mw,
+            op=lambda col: self.streak_history.scan_revlog(col, last_id),
+            success=on_scanned,
+        ).failure(on_failed).with_progress("Loading streak history...").run_in_background()
+
+    def _finish_startup(self, timings, end_phase):
+        if not self.mw.col:
+            return
+        self.history_ready = True
+
+        self._toolbar_suspended = True
+        try:
+            self.recalculate_streak()
+        finally:
+            self._toolbar_suspended = False
+        end_phase("recompute")
+
+        self._update_toolbar()
+        end_phase("render")
 
-        gui_hooks.profile_did_open.append(self.recalculate_streak)
-        gui_hooks.reviewer_did_answer_card.append(self.update_streak_for_review)
-        gui_hooks.sync_did_finish.append(self.update_reviews_on_sync)
+        self._schedule_rollover()
 
-        if self.mw and self.mw.col:
+        self.startup_timings = timings
+        summary = ", ".join(f"{name} {ms:.1f} ms" for name, ms in timings.items())
+        print(f"[AnkiStreak] Startup: {summary} (total {sum(timings.values()):.1f} ms)")
+
+        if self._sync_pending:
+            self._sync_pending = False
+            self.update_reviews_on_sync()
+
+    def _schedule_rollover(self):
+        due = self.day_clock.next_rollover() + ROLLOVER_GRACE_SECONDS
+        self.scheduler.schedule_at(ROLLOVER_JOB, due, self._on_day_rollover)
+
+    def _on_day_rollover(self):
+        # Brings the streak, freezes and toolbar over to the new day while
+        # Anki sits open, instead of waiting for the next answer or sync.
+        if not (self.mw and self.mw.col):
+            return
+        if self.history_ready:
             self.recalculate_streak()
+        self._schedule_rollover()
+
+    def _on_profile_will_close(self):
+        self.scheduler.cancel(ROLLOVER_JOB)
+        self.flush_data()
+
+    def _render_loading_toolbar(self):
+        from ..ui.icon import get_base64_icon_data
+
+        loading_style = "font-weight:bold; font-size:16px; position:relative; top:2px; color:#888888;"
+        self.mw.streak_button_text = (
+            f"<img src='{get_base64_icon_data('grey_streak')}' style='height:20px; vertical-align:middle;' /> "
+            f"<span style='{loading_style}'>…</span>"
+        )
+        self.mw.freeze_button_text = (
+            f"<img src='{get_base64_icon_data('frozen_streak')}' style='height:20px; vertical-align:middle;' /> "
+            f"<span style='{loading_style}'>…</span>"
+        )
+        # Drawn in full once; the final render then swaps the labels in place.
+        self._toolbar_state = ("loading",)
+        if hasattr(self.mw, 'toolbar'):
+            self.mw.toolbar.draw()
+
+    def _load_state(self):
+        self.data = self._load_data()
+        self.freeze_ledger = FreezeLedger.from_data(self.data)
+        self.freeze_log = FreezeEventLog(self.streak_history.addon_dir, self.streak_history.profile_key())
+        self._day_index = None
+
+    def _write_freezes(self):
+        self.freeze_ledger.store(self.data)
+        self.freeze_log.append(self.freeze_ledger.take_unlogged())
+
+    def _store_freezes(self):
+        self._write_freezes()
+        self._save_data()
+        self._update_toolbar()
 
     def _load_data(self):
         default_data = {
@@ -42,12 +192,13 @@ class StreakManager:
             "last_sync_date": None
         }
         data = self.mw.col.get_config(self.CONFIG_KEY, default_data)
+        self._last_saved_data = json.dumps(data, sort_keys=True)
         data.setdefault("current_streak_length", 0)
         data.setdefault("last_active_day", None)
         # Handle migration from old 'streak_freezes_available' if it exists
         if "streak_freezes_available" in data and not data.get("earned_freeze_dates"):
             for _ in range(data["streak_freezes_available"]):
-                data["earned_freeze_dates"].append(datetime.today().date().strftime("%Y-%m-%d"))
+                data["earned_freeze_dates"].append(self.day_clock.today_key())
             del data["streak_freezes_available"]
 
         data.setdefault("earned_freeze_dates", [])
@@ -61,149 +212,156 @@ class StreakManager:
         return data
 
     def _save_data(self):
-        if self.mw and self.mw.col and self.data:
-            self.mw.col.set_config(self.CONFIG_KEY, self.data)
+        # Changes are held in memory and written in one batch when the flush
+        # job runs, the profile closes or a sync starts.
+        if not self.data:
+            return
+        self._data_version += 1
+        if not self.scheduler.is_scheduled(FLUSH_JOB):
+            self.scheduler.schedule_in(FLUSH_JOB, SAVE_DELAY_MS, self.flush_data)
+
+    def flush_data(self):
+        self.scheduler.cancel(FLUSH_JOB)
+        if not (self.mw and self.mw.col and self.data):
+            return
+
+        # set_config marks the collection modified and adds to the next sync,
+        # so only write when the data differs from what is stored.
+        serialized = json.dumps(self.data, sort_keys=True)
+        if serialized == self._last_saved_data:
+            return
+        self.mw.col.set_config(self.CONFIG_KEY, self.data)
+        self._last_saved_data = serialized
 
     def add_streak_freeze(self, count: int = 1):
         if self.data is None:
-            return        
-        
-        ts_now = time.time()
-        cutoff_timestamp = mw.col.sched.day_cutoff 
-        cutoff_datetime = datetime.fromtimestamp(cutoff_timestamp)
-        offset_seconds = cutoff_datetime.hour * 3600 + cutoff_datetime.minute * 60 + cutoff_datetime.second
-        today = datetime.fromtimestamp(ts_now - offset_seconds)
-        today_str = today.strftime("%Y-%m-%d")
-        
-        for _ in range(count):
-            if len(self.data["earned_freeze_dates"]) < self.MAX_STREAK_FREEZES:
-                self.data["earned_freeze_dates"].append(today_str)
-            else:
-                break
-        self.data["earned_freeze_dates"].sort()
-        self._save_data()
-        self._update_toolbar()
+            return
+
+        self.freeze_ledger.earn(self.day_clock.today_ordinal(), count, self.MAX_STREAK_FREEZES)
+        self._store_freezes()
 
     def consume_streak_freeze(self, date_to_cover_str: str) -> bool:
         if self.data is None:
             return False
 
-        date_to_cover_obj = datetime.strptime(date_to_cover_str, "%Y-%m-%d").date()
-
-        found_index = -1
-        for i, earned_date_str in enumerate(self.data["earned_freeze_dates"]):
-            earned_date_obj = datetime.strptime(earned_date_str, "%Y-%m-%d").date()
-            if earned_date_obj <= date_to_cover_obj:
-                found_index = i
-                break
-
-        if found_index != -1 and date_to_cover_str not in self.data["consumed_freeze_dates"]:
-            self.data["earned_freeze_dates"].pop(found_index)  # Remove the used freeze
-            self.data["consumed_freeze_dates"].append(date_to_cover_str)
-            self.data["consumed_freeze_dates"].sort()
-            self._save_data()
-            self._update_toolbar()
-            return True
-        return False
+        ordinal = parse_day_key(date_to_cover_str)
+        if ordinal in self.freeze_ledger.consumed:
+            return False
+        return self._cover_missed_days(ordinal, ordinal)
 
-    def _is_day_active(self, check_date: date, actual_reviewed_dates: set, current_consumed_freezes: set) -> bool:
-        date_str = check_date.strftime("%Y-%m-%d")
-        return date_str in actual_reviewed_dates or date_str in current_consumed_freezes
+    def _cover_missed_days(self, first_ordinal: int, last_ordinal: int) -> bool:
+        if not self.freeze_ledger.cover_gap(first_ordinal, last_ordinal):
+            return False
+        self._store_freezes()
+        return True
+
+    def rebuild_freeze_ledger(self):
+        # Replays the reviewed days into a new ledger, for when the stored
+        # one is unreadable.
+        self.freeze_ledger = FreezeLedger.rebuild(
+            self.streak_history.get_day_ordinals(), self.day_clock.today_ordinal(),
+            DAYS_PER_FREEZE, self.MAX_STREAK_FREEZES)
+        self._day_index = None
+        self._store_freezes()
+        print(f"AnkiStreak: Rebuilt freeze ledger from history ({self.freeze_ledger.available()} available)")
+
+    def _get_day_index(self) -> DayIndex:
+        key = (self.streak_history.version, self.freeze_ledger.version)
+        if self._day_index is None or self._day_index_key != key:
+            self._day_index = DayIndex(self.streak_history.get_day_ordinals(), self.freeze_ledger.consumed)
+            self._day_index_key = key
+            self._day_index_version += 1
+        return self._day_index
+
+    def get_day_index_version(self) -> int:
+        self.get_day_index()
+        return self._day_index_version
+
+    def get_state_version(self) -> tuple:
+        # Changes whenever the streak popup's header may have changed:
+        # freeze data, reviewed days or the day. Review totals only feed the
+        # calendar, which keeps its own per-month versions.
+        if self.data is None:
+            self.recalculate_streak()
+        return (
+            self._data_version,
+            self.get_day_index_version(),
+            self.day_clock.today_ordinal(),
+        )
 
     def recalculate_streak(self):
         if self.data is None:
-            self.data = self._load_data()
-
-        actual_reviewed_dates = self.streak_history.get_streak_days()
-        current_consumed_freezes = set(self.data["consumed_freeze_dates"])
-      
-        ts_now = time.time()
-        cutoff_timestamp = mw.col.sched.day_cutoff 
-        cutoff_datetime = datetime.fromtimestamp(cutoff_timestamp)
-        offset_seconds = cutoff_datetime.hour * 3600 + cutoff_datetime.minute * 60 + cutoff_datetime.second
-        today = datetime.fromtimestamp(ts_now - offset_seconds)
-                        
-        yesterday = today - timedelta(days=1)
-        
-        today_is_active = self._is_day_active(today, actual_reviewed_dates, current_consumed_freezes)
-
-        calculated_streak = 0
-        final_last_active_day_obj = None
-
-        if today_is_active:
-            final_last_active_day_obj = today
-            calculated_streak = 1
-            check_date = yesterday
+            self._load_state()
+        if self.freeze_ledger.needs_rebuild and self.history_ready:
+            self.rebuild_freeze_ledger()
+
+        today_ordinal = self.day_clock.today_ordinal()
+        yesterday_ordinal = today_ordinal - 1
+        day_index = self._get_day_index()
+        previous_active_ordinal = day_index.last_active_before(today_ordinal)
+
+        if (previous_active_ordinal is not None and previous_active_ordinal < yesterday_ordinal
+                and self._cover_missed_days(previous_active_ordinal + 1, yesterday_ordinal)):
+            # Anki may not have been opened (or the computer was asleep) for
+            # several days; every missed day since the last active one is
+            # covered, or none is. This holds whether or not today's first
+            # answer has already been recorded.
+            day_index = self._get_day_index()
+
+        if day_index.is_active(today_ordinal):
+            final_last_active_ordinal = today_ordinal
+        elif day_index.is_active(yesterday_ordinal):
+            final_last_active_ordinal = yesterday_ordinal
         else:
-            yesterday_is_active = self._is_day_active(yesterday, actual_reviewed_dates, current_consumed_freezes)
-            if not yesterday_is_active:
-                if self.consume_streak_freeze(yesterday.strftime("%Y-%m-%d")):
-                    current_consumed_freezes.add(yesterday.strftime("%Y-%m-%d"))
-                    final_last_active_day_obj = yesterday
-                    calculated_streak = 1
-                    check_date = yesterday - timedelta(days=1)
-                else:
-                    self.data["current_streak_length"] = 0
-                    self.data["last_active_day"] = None
-                    self._save_data()
-                    self._update_toolbar()
-                    return
-            else:
-                final_last_active_day_obj = yesterday
-                calculated_streak = 1
-                check_date = yesterday - timedelta(days=1)
-
-        while True:
-            date_str = check_date.strftime("%Y-%m-%d")
-
-            is_reviewed = date_str in actual_reviewed_dates
-            is_frozen = date_str in current_consumed_freezes
-
-            if is_reviewed or is_frozen:
-                calculated_streak += 1
-            else:
-                break
-
-            check_date -= timedelta(days=1)
-            if calculated_streak > 365 * 10:
-                break
+            self.data["current_streak_length"] = 0
+            self.data["last_active_day"] = None
+            self._recalculated_day = today_ordinal
+            self._save_data()
+            self._update_toolbar()
+            return
 
-        total_potential_freezes = calculated_streak // DAYS_PER_FREEZE
+        calculated_streak = day_index.streak_ending_at(final_last_active_ordinal)
 
         self.data["days_since_last_freeze"] = calculated_streak % DAYS_PER_FREEZE
 
-        consumed_count = len(self.data.get("consumed_freeze_dates", []))
-        current_available_in_data = len(self.data.get("earned_freeze_dates", []))
-        net_earned_so_far = consumed_count + current_available_in_data
-
-        if total_potential_freezes > net_earned_so_far:
-            newly_earned_count = total_potential_freezes - net_earned_so_far
-            if (current_available_in_data + newly_earned_count) > self.MAX_STREAK_FREEZES:
-                newly_earned_count = self.MAX_STREAK_FREEZES - current_available_in_data
-            
-            if newly_earned_count > 0:
-                self.add_streak_freeze(newly_earned_count)        
-
-        if len(self.data["earned_freeze_dates"]) > self.MAX_STREAK_FREEZES:
-            self.data["earned_freeze_dates"].sort()
-            self.data["earned_freeze_dates"] = self.data["earned_freeze_dates"][-self.MAX_STREAK_FREEZES:]
+        # Freezes are credited per streak run, so a reset starts the next
+        # run from zero milestones instead of from what was ever earned.
+        ledger = self.freeze_ledger
+        ledger_version = ledger.version
+        run_start = final_last_active_ordinal - calculated_streak + 1
+        if ledger.run_start is None:
+            ledger.adopt_run(run_start, calculated_streak, DAYS_PER_FREEZE, self.MAX_STREAK_FREEZES)
+        ledger.credit_run(run_start, calculated_streak, DAYS_PER_FREEZE, self.MAX_STREAK_FREEZES)
+        ledger.trim(self.MAX_STREAK_FREEZES)
+        if ledger.version != ledger_version:
+            self._write_freezes()
 
         self.data["current_streak_length"] = calculated_streak
-        # final_last_active_day_obj represents the most recent day in the streak
-        self.data["last_active_day"] = final_last_active_day_obj.strftime(
-            "%Y-%m-%d") if final_last_active_day_obj else None
+        # final_last_active_ordinal represents the most recent day in the streak
+        self.data["last_active_day"] = format_day_key(final_last_active_ordinal)
+        self._recalculated_day = today_ordinal
         self._save_data()
         self._update_toolbar()
 
     def _update_toolbar(self):
         from ..ui.icon import get_base64_icon_data
 
+        if self._toolbar_suspended:
+            return
         if not self.data:
-            self.data = self._load_data()
+            self._load_state()
 
         current_streak = self.data["current_streak_length"]
+        reviewed_today = self.has_reviewed_today()
+        freezes_available = self.freeze_ledger.available()
+
+        toolbar_state = (current_streak, reviewed_today, freezes_available)
+        if toolbar_state == self._toolbar_state:
+            return
+        first_render = self._toolbar_state is None
+        self._toolbar_state = toolbar_state
 
-        if self.has_reviewed_today():
+        if reviewed_today:
             icon_data_uri = get_base64_icon_data("streak")
             icon_color_style = "color:orange;"
         else:
@@ -216,8 +374,6 @@ class StreakManager:
             f"{current_streak}</span>"
         )
 
-        freezes_available = len(self.data["earned_freeze_dates"])
-
         self.mw.freeze_button_text = (
             f"<img src='{get_base64_icon_data('frozen_streak')}' style='height:20px; vertical-align:middle;' /> "
             f"<span style='font-weight:bold; font-size:16px; position:relative; top:2px; color:#9BDDFD'>"
@@ -225,7 +381,42 @@ class StreakManager:
         )
 
         if hasattr(self.mw, 'toolbar'):
-            self.mw.toolbar.draw()
+            if first_render:
+                self.mw.toolbar.draw()
+            else:
+                self._update_toolbar_links()
+
+    def _update_toolbar_links(self):
+        # Swap the two link labels in place rather than reloading the whole
+        # toolbar webview. If the links aren't on the page yet, fall back to
+        # a full draw, which picks up the new labels from mw.
+        js = (
+            "(function() {"
+            " var streak = document.querySelector('a.streak-link');"
+            " var freeze = document.querySelector('a.freeze-link');"
+            " if (!streak || !freeze) { return false; }"
+            f" streak.innerHTML = {json.dumps(self.mw.streak_button_text)};"
+            f" freeze.innerHTML = {json.dumps(self.mw.freeze_button_text)};"
+            " return true;"
+            "})()"
+        )
+
+        def on_done(updated):
+            if not updated:
+                self.mw.toolbar.draw()
+
+        self.mw.toolbar.web.evalWithCallback(js, on_done)
+
+    def get_day_index(self) -> DayIndex:
+        if self.data is None:
+            self.recalculate_streak()
+        return self._get_day_index()
+
+    def get_longest_streak_length(self) -> int:
+        return self.get_day_index().longest_streak()
+
+    def get_streak_length_on_date(self, check_date: date) -> int:
+        return self.get_day_index().streak_ending_at(check_date.toordinal())
 
     def get_current_streak_length(self) -> int:
         if self.data is None:
@@ -235,7 +426,7 @@ class StreakManager:
     def get_streak_freezes_available(self) -> int:
         if self.data is None:
             self.recalculate_streak()
-        return len(self.data["earned_freeze_dates"]) if self.data else 0
+        return self.freeze_ledger.available() if self.data else 0
 
     def get_consumed_freeze_dates(self) -> List[str]:
         if self.data is None:
@@ -247,6 +438,13 @@ class StreakManager:
             self.recalculate_streak()
         return self.data["earned_freeze_dates"] if self.data else []
 
+    def get_freeze_history(self) -> List[list]:
+        # Every freeze event recorded on this device, oldest first; see
+        # freeze_ledger for their shapes.
+        if self.data is None:
+            self.recalculate_streak()
+        return self.freeze_log.read() + self.freeze_ledger.unlogged
+
     def get_last_active_day(self) -> Union[str, None]:
         if self.data is None:
             self.recalculate_streak()
@@ -257,55 +455,42 @@ class StreakManager:
             self.recalculate_streak()
         return self.data.get("days_since_last_freeze", 0)
 
+    def get_today(self) -> date:
+        # The current Anki day, which starts at the scheduler's rollover hour
+        # rather than at midnight.
+        return self.day_clock.today()
+
     def has_reviewed_today(self) -> bool:
-        
-        ts_now = time.time()
-        cutoff_timestamp = mw.col.sched.day_cutoff 
-        cutoff_datetime = datetime.fromtimestamp(cutoff_timestamp)
-        offset_seconds = cutoff_datetime.hour * 3600 + cutoff_datetime.minute * 60 + cutoff_datetime.second
-        today = datetime.fromtimestamp(ts_now - offset_seconds)
-        today_str = today.strftime("%Y-%m-%d")
-        return today_str in self.streak_history.get_streak_days()
+        return self.day_clock.today_ordinal() in self.streak_history.get_day_ordinals()
 
     def get_review_count_for_date(self, check_date: date) -> int:
-        
-        cutoff_timestamp = mw.col.sched.day_cutoff 
-        cutoff_datetime = datetime.fromtimestamp(cutoff_timestamp)
-        offset_seconds = cutoff_datetime.hour * 3600 + cutoff_datetime.minute * 60 + cutoff_datetime.second
-        
-        start_dt = datetime(check_date.year, check_date.month, check_date.day)
-        end_dt = start_dt + timedelta(days=1)
-
-        start_ts = int(start_dt.timestamp() + offset_seconds)
-        end_ts = int(end_dt.timestamp() + offset_seconds)
-        
-        query = "select count(*) from revlog where id  >= ? and id  < ?"
-        count = self.mw.col.db.scalar(query,  start_ts * 1000,  end_ts * 1000)
-
-        return count
+        return self.get_day_review_stats(check_date).reviews
 
     def get_review_details_for_date(self, check_date: date) -> dict:
         if not self.mw or not self.mw.col:
             return {}
-        
-        cutoff_timestamp = mw.col.sched.day_cutoff 
-        cutoff_datetime = datetime.fromtimestamp(cutoff_timestamp)
-        offset_seconds = cutoff_datetime.hour * 3600 + cutoff_datetime.minute * 60 + cutoff_datetime.second
-        
-        start_dt = datetime(check_date.year, check_date.month, check_date.day)
-        end_dt = start_dt + timedelta(days=1)
-
-        start_ts = int(start_dt.timestamp() + offset_seconds)
-        end_ts = int(end_dt.timestamp() + offset_seconds)
-               
+        return self.get_day_review_stats(check_date).as_details()
+
+    def get_day_review_stats(self, check_date: date) -> DayReviewStats:
+        ordinal = check_date.toordinal()
+        stats = self.review_stats.get(ordinal)
+        if stats is None:
+            stats = self._fetch_day_review_stats(check_date)
+            self.review_stats.put(ordinal, stats)
+        return stats
+
+    def _fetch_day_review_stats(self, check_date: date) -> DayReviewStats:
+        start_ts, end_ts = self.day_clock.day_bounds(check_date)
+
+        # Left joins keep reviews of deleted cards in the day's totals.
         query = """
                 SELECT d.name, \
                        COUNT(r.id), \
                        SUM(r.time)
                 FROM revlog r \
-                         JOIN \
+                         LEFT JOIN \
                      cards c ON r.cid = c.id \
-                         JOIN \
+                         LEFT JOIN \
                      decks d ON c.did = d.id
                 WHERE r.id  >= ? \
                   AND r.id  < ?
@@ -313,20 +498,98 @@ class StreakManager:
                 ORDER BY d.name \
                 """
         results = self.mw.col.db.all(query, start_ts * 1000, end_ts * 1000)
-           
-        details = {}
+
+        stats = DayReviewStats()
         for deck_name, review_count, time_spent_ms in results:
-            details[deck_name] = {
-                "reviews": review_count,
-                "time_spent_ms": time_spent_ms
-            }
-        return details
+            stats.add(deck_name, review_count, time_spent_ms or 0)
+        return stats
+
+    def get_review_totals_for_range(self, start_date: date, end_date: date) -> Dict[int, List[int]]:
+        # Per-day [review count, time spent in ms] for start_date up to and
+        # including end_date, from one grouped query. Days without reviews
+        # are left out.
+        if not self.mw or not self.mw.col:
+            return {}
+
+        start_ts = self.day_clock.day_bounds(start_date)[0]
+        end_ts = self.day_clock.day_bounds(end_date)[1]
+
+        query = """
+                SELECT id / 1000 / ? AS bucket, \
+                       COUNT(), \
+                       SUM(time)
+                FROM revlog
+                WHERE id >= ? \
+                  AND id < ?
+                GROUP BY bucket
+                ORDER BY bucket \
+                """
+        rows = self.mw.col.db.all(query, BUCKET_SECONDS, start_ts * 1000, end_ts * 1000)
+        row_totals = {bucket: (review_count, time_spent_ms or 0) for bucket, review_count, time_spent_ms in rows}
+
+        totals = {}
+        for bucket, ordinal in bucket_day_ordinals((bucket for bucket, _, _ in rows), self.day_clock.rollover):
+            review_count, time_spent_ms = row_totals[bucket]
+            day_totals = totals.setdefault(ordinal, [0, 0])
+            day_totals[0] += review_count
+            day_totals[1] += time_spent_ms
+        return totals
+
+    def get_review_totals_for_month(self, year: int, month: int) -> Dict[int, List[int]]:
+        totals = self.review_stats.get_month(year, month)
+        if totals is None:
+            first_day = date(year, month, 1)
+            last_day = date(year, month, calendar.monthrange(year, month)[1])
+            totals = self.get_review_totals_for_range(first_day, last_day)
+            self.review_stats.put_month(year, month, first_day.toordinal(), last_day.toordinal(), totals)
+        return totals
+
+    def _record_answer_in_review_stats(self, card):
+        # Only already cached entries are updated; anything uncached is read
+        # from the revlog, answer included, the first time it is asked for.
+        today = self.day_clock.today()
+        today_ordinal = today.toordinal()
+        stats = self.review_stats.get(today_ordinal)
+        month_cached = self.review_stats.get_month(today.year, today.month) is not None
+        if card is None or (stats is None and not month_cached):
+            return
+        # The answered card carries what the revlog row would tell us, so
+        # this runs without a query on every answer.
+        time_spent_ms = card.time_taken() or 0
+        if stats is not None:
+            stats.add(self.mw.col.decks.name(card.did), 1, time_spent_ms)
+        self.review_stats.add_review(today_ordinal, time_spent_ms)
+
+    def _on_undo(self, *args: Any):
+        today_ordinal = self.day_clock.today_ordinal()
+        self.review_stats.invalidate(today_ordinal - 1, today_ordinal)
 
     def update_reviews_on_sync(self):
+        if not self.history_ready:
+            self._sync_pending = True
+            return
+        self.day_clock.invalidate()
+        self.review_stats.invalidate(self.day_clock.today_ordinal() - SYNC_LOOKBACK_DAYS)
+        self.streak_history.import_reviewed_days_from_log(lookback_days=SYNC_LOOKBACK_DAYS)
+        self.streak_history.save()
         self.recalculate_streak()
+        # The sync may have changed the rollover hour.
+        self._schedule_rollover()
 
     def update_streak_for_review(self, *args: Any, **kwargs: Any):
-        self.recalculate_streak()
+        # reviewer_did_answer_card passes (reviewer, card, ease).
+        card = args[1] if len(args) > 1 else kwargs.get("card")
+        self._record_answer_in_review_stats(card)
+
+        # Only the first answer of a day can change the streak. Every later
+        # answer is a set lookup; rollovers fall through to a full recalculation.
+        today_ordinal = self.day_clock.today_ordinal()
+        if today_ordinal == self._recalculated_day and today_ordinal in self.streak_history.get_day_ordinals():
+            return
+
+        self.streak_history.add_day_ordinal(today_ordinal)
+        if self.history_ready:
+            self.recalculate_streak()
 
 _global_streak_manager_instance = None
 
@@ -0,0 +1,156 @@
+from datetime import date
+from PyQt6.QtCore import Qt, QRect, QRectF, QPoint, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QCursor
+from PyQt6.QtWidgets import QWidget
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HOVER_FILL = QColor("#555555")
+
+
+class DayCell:
+    __slots__ = ("date", "fill", "text_color", "border_color", "border_width", "font_size")
+
+    def __init__(self, day_date: date, fill: str = None, text_color: str = "white",
+                 border_color: str = None, border_width: int = 0, font_size: int = 20):
+        self.date = day_date
+        self.fill = QColor(fill) if fill else None
+        self.text_color = QColor(text_color)
+        self.border_color = QColor(border_color) if border_color else None
+        self.border_width = border_width
+        self.font_size = font_size
+
+
+# Paints the weekday header and a 7x6 month grid in one pass. Cells are plain
+# DayCell state; hover and clicks are resolved by hit-testing cell rects.
+class CalendarGrid(QWidget):
+    day_clicked = pyqtSignal(object, QRect)
+
+    COLUMNS = 7
+    ROWS = 6
+    HEADER_HEIGHT = 30
+    MAX_CELL_SIZE = 50
+    CORNER_RADIUS = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cells = [None] * (self.COLUMNS * self.ROWS)
+        self._hover_index = -1
+        self.setMouseTracking(True)
+        self.setMinimumSize(self.COLUMNS * (self.MAX_CELL_SIZE + 4),
+                            self.HEADER_HEIGHT + self.ROWS * (self.MAX_CELL_SIZE + 4))
+
+        self._header_font = QFont()
+        self._header_font.setPixelSize(18)
+        self._header_font.setBold(True)
+        self._cell_fonts = {}
+
+    def set_cells(self, cells: list):
+        self.cells = cells
+        self._set_hover_index(-1)
+        self.update()
+
+    def _column_width(self) -> float:
+        return self.width() / self.COLUMNS
+
+    def _row_height(self) -> float:
+        return (self.height() - self.HEADER_HEIGHT) / self.ROWS
+
+    def _cell_size(self) -> int:
+        return int(min(self.MAX_CELL_SIZE, self._column_width() - 4, self._row_height() - 4))
+
+    def cell_rect(self, index: int) -> QRect:
+        row, column = divmod(index, self.COLUMNS)
+        size = self._cell_size()
+        x = column * self._column_width() + (self._column_width() - size) / 2
+        y = self.HEADER_HEIGHT + row * self._row_height() + (self._row_height() - size) / 2
+        return QRect(int(x), int(y), size, size)
+
+    def index_at(self, pos: QPoint) -> int:
+        if pos.y() < self.HEADER_HEIGHT:
+            return -1
+        column = int(pos.x() // self._column_width())
+        row = int((pos.y() - self.HEADER_HEIGHT) // self._row_height())
+        if not (0 <= column < self.COLUMNS and 0 <= row < self.ROWS):
+            return -1
+        index = row * self.COLUMNS + column
+        if self.cells[index] is None or not self.cell_rect(index).contains(pos):
+            return -1
+        return index
+
+    def _cell_font(self, size: int) -> QFont:
+        font = self._cell_fonts.get(size)
+        if font is None:
+            font = QFont()
+            font.setPixelSize(size)
+            font.setBold(True)
+            self._cell_fonts[size] = font
+        return font
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        painter.setFont(self._header_font)
+        painter.setPen(QColor("white"))
+        column_width = self._column_width()
+        for column, name in enumerate(WEEKDAY_NAMES):
+            header_rect = QRectF(column * column_width, 0, column_width, self.HEADER_HEIGHT)
+            painter.drawText(header_rect, Qt.AlignmentFlag.AlignCenter, name)
+
+        for index, cell in enumerate(self.cells):
+            if cell is None:
+                continue
+            rect = QRectF(self.cell_rect(index))
+            if not event.rect().intersects(rect.toAlignedRect()):
+                continue
+
+            fill = cell.fill
+            if index == self._hover_index:
+                fill = fill.lighter(120) if fill is not None else HOVER_FILL
+            if fill is not None:
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(fill)
+                painter.drawRoundedRect(rect, self.CORNER_RADIUS, self.CORNER_RADIUS)
+
+            if cell.border_color is not None and cell.border_width:
+                inset = cell.border_width / 2
+                painter.setPen(QPen(cell.border_color, cell.border_width))
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRoundedRect(rect.adjusted(inset, inset, -inset, -inset),
+                                        self.CORNER_RADIUS, self.CORNER_RADIUS)
+
+            painter.setFont(self._cell_font(cell.font_size))
+            painter.setPen(cell.text_color)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(cell.date.day))
+
+        painter.end()
+
+    def _set_hover_index(self, index: int):
+        if index == self._hover_index:
+            return
+        for old_or_new in (self._hover_index, index):
+            if old_or_new >= 0:
+                self.update(self.cell_rect(old_or_new))
+        self._hover_index = index
+        if index >= 0:
+            self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        else:
+            self.unsetCursor()
+
+    def mouseMoveEvent(self, event):
+        self._set_hover_index(self.index_at(event.position().toPoint()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._set_hover_index(-1)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            index = self.index_at(event.position().toPoint())
+            if index >= 0:
+                rect = self.cell_rect(index)
+                global_rect = QRect(self.mapToGlobal(rect.topLeft()), rect.size())
+                self.day_clicked.emit(self.cells[index].date, global_rect)
+                return
+        super().mousePressEvent(event)
@@ -1,23 +1,32 @@
 import calendar
 from datetime import date
-from PyQt6.QtCore import Qt as QtCoreQt, QEvent, QPoint
+from PyQt6.QtCore import Qt as QtCoreQt, QRect, QTimer
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QGridLayout, QToolTip
+    QToolTip, QStackedWidget, QScrollArea, QFrame, QButtonGroup
 )
-from PyQt6.QtGui import QCursor, QMouseEvent, QColor
+from .calendar_grid import CalendarGrid, DayCell
+from .year_heatmap import YearHeatmap
 from .day_details_popup import DayDetailsPopup
 from ..logic.streak_manager import get_streak_manager
-import re
+
+# Reviewed-day shades from the lightest to the busiest quarter of the month.
+REVIEWED_DAY_COLORS = ["#A35F00", "#BD6E00", "#D67E00", "#F08D00"]
+
+VIEW_MONTH = "month"
+VIEW_YEAR = "year"
+VIEW_ALL = "all"
 
 class CalendarWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.streak_manager = get_streak_manager()
-        self.current_date = date.today().replace(day=1)
+        self.current_date = self.streak_manager.get_today().replace(day=1)
         self.displayed_date = self.current_date
+        self.displayed_year = self.current_date.year
+        self.view_mode = VIEW_MONTH
+        self._month_cells = {}
         self.setStyleSheet("background-color: #2e2e2e;")
-        self.setMouseTracking(False)  # Essential for getting QEvent.MouseMove
 
         bottom_layout = QVBoxLayout(self)
         bottom_layout.setAlignment(QtCoreQt.AlignmentFlag.AlignTop)
@@ -32,8 +41,33 @@ class CalendarWidget(QWidget):
         calendar_title.setStyleSheet("font-size: 20px; font-weight: bold; color: white;")
         calendar_title.setAlignment(QtCoreQt.AlignmentFlag.AlignLeft)
 
-
         header_layout.addWidget(calendar_title, 0, QtCoreQt.AlignmentFlag.AlignLeft)
+        header_layout.addStretch()
+
+        self.view_buttons = QButtonGroup(self)
+        for mode, text in ((VIEW_MONTH, "Month"), (VIEW_YEAR, "Year"), (VIEW_ALL, "All")):
+            view_button = QPushButton(text)
+            view_button.setCheckable(True)
+            view_button.setChecked(mode == self.view_mode)
+            view_button.setFixedHeight(26)
+            view_button.setStyleSheet("""
+                QPushButton {
+                    background-color: transparent;
+                    color: #AAAAAA;
+                    font-size: 14px;
+                    font-weight: bold;
+                    border: 1px solid #666666;
+                    border-radius: 6px;
+                    padding: 0px 8px;
+                }
+                QPushButton:checked {
+                    color: white;
+                    border-color: #D67E00;
+                }
+            """)
+            view_button.clicked.connect(lambda checked, mode=mode: self.set_view_mode(mode))
+            self.view_buttons.addButton(view_button)
+            header_layout.addWidget(view_button)
         bottom_layout.addWidget(header_widget)
 
         calendar_container = QWidget()
@@ -86,8 +120,8 @@ class CalendarWidget(QWidget):
         self.prev_button = prev_button
         self.update_calendar_nav_buttons()
 
-        self.prev_button.clicked.connect(self.show_previous_month)
-        self.next_button.clicked.connect(self.show_next_month)
+        self.prev_button.clicked.connect(self.show_previous)
+        self.next_button.clicked.connect(self.show_next)
 
         self.month_label = QLabel(self.displayed_date.strftime("%B %Y"))
         self.month_label.setStyleSheet("font-size: 18px; font-weight: bold; color: white;")
@@ -101,75 +135,41 @@ class CalendarWidget(QWidget):
 
         calendar_header_widget.setLayout(calendar_header_layout)
 
-        calendar_body = QWidget()
-        self.calendar_grid_layout = QGridLayout(calendar_body)
-        self.calendar_grid_layout.setContentsMargins(10, 10, 10, 10)
-        self.calendar_grid_layout.setSpacing(10)
+        self.calendar_grid = CalendarGrid()
+        self.calendar_grid.day_clicked.connect(self._on_day_clicked)
 
-        days_of_week = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for i, day in enumerate(days_of_week):
-            label = QLabel(day)
-            label.setStyleSheet("color: white; font-weight: bold; font-size: 18px;")
-            label.setAlignment(QtCoreQt.AlignmentFlag.AlignCenter)
-            self.calendar_grid_layout.addWidget(label, 0, i)
+        self.year_heatmap = YearHeatmap()
+        self.year_heatmap.day_clicked.connect(self._on_day_clicked)
+
+        self.heatmap_scroll = QScrollArea()
+        self.heatmap_scroll.setFrameShape(QFrame.Shape.NoFrame)
+        self.heatmap_scroll.setHorizontalScrollBarPolicy(QtCoreQt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.heatmap_scroll.setAlignment(QtCoreQt.AlignmentFlag.AlignHCenter | QtCoreQt.AlignmentFlag.AlignTop)
+        self.heatmap_scroll.setWidget(self.year_heatmap)
+
+        self.calendar_stack = QStackedWidget()
+        self.calendar_stack.addWidget(self.calendar_grid)
+        self.calendar_stack.addWidget(self.heatmap_scroll)
 
-        calendar_body.setLayout(self.calendar_grid_layout)
         calendar_layout.setAlignment(QtCoreQt.AlignmentFlag.AlignTop)
         calendar_layout.addWidget(calendar_header_widget)
-        calendar_layout.addWidget(calendar_body)
+        calendar_layout.addWidget(self.calendar_stack)
 
         calendar_container.setLayout(calendar_layout)
         bottom_layout.addWidget(calendar_container)
 
-        self.day_labels = []
-
-        for i in range(6):
-            for j in range(7):
-                label = QLabel()
-                label.setAlignment(QtCoreQt.AlignmentFlag.AlignCenter)
-                label.setStyleSheet("color: white; padding: 6px;")
-                label.setFixedSize(50, 50)
-                self.calendar_grid_layout.addWidget(label, i + 1, j)
-                self.day_labels.append(label)
-                label.installEventFilter(self) # Re-enable event filter
-
         self.refresh_calendar_grid()
 
-    def eventFilter(self, obj, event):
-        if obj in self.day_labels:
-            if event.type() == QEvent.Type.Enter:
-                if hasattr(obj, '_associated_date'): # Only apply hover if it's a valid day
-                    # Store original stylesheet
-                    obj._original_stylesheet = obj.styleSheet()
-
-                    # Extract current background color
-                    current_style = obj.styleSheet()
-                    bg_color_match = re.search(r'background-color:\s*([^;]+)', current_style)
-                    if bg_color_match:
-                        current_bg_color_str = bg_color_match.group(1).strip()
-                        current_color = QColor(current_bg_color_str)
-                        lighter_color = current_color.lighter(120) # Make it 20% lighter
-                        obj.setStyleSheet(current_style.replace(current_bg_color_str, lighter_color.name()))
-                    else:
-                        # Fallback if no background-color found (e.g., transparent)
-                        obj.setStyleSheet("background-color: #555555; color: white; padding: 6px; border-radius: 10px; font-size: 20px; font-weight: bold;")
-
-                    self.setCursor(QCursor(QtCoreQt.CursorShape.PointingHandCursor))
-                return True
-            elif event.type() == QEvent.Type.Leave:
-                if hasattr(obj, '_associated_date'): # Only revert if it was a valid day
-                    # Revert to original stylesheet
-                    if hasattr(obj, '_original_stylesheet'):
-                        obj.setStyleSheet(obj._original_stylesheet)
-                    else:
-                        # Fallback if original stylesheet not stored
-                        self.refresh_calendar_grid() # Re-render the grid to reset styles
-                    self.unsetCursor()
-                return True
-        return super().eventFilter(obj, event)
-
     def update_calendar_nav_buttons(self):
-        if (self.displayed_date.year, self.displayed_date.month) == (date.today().year, date.today().month):
+        today = self.streak_manager.get_today()
+        if self.view_mode == VIEW_MONTH:
+            at_latest = (self.displayed_date.year, self.displayed_date.month) == (today.year, today.month)
+        else:
+            at_latest = self.view_mode == VIEW_ALL or self.displayed_year == today.year
+        self.prev_button.setVisible(self.view_mode != VIEW_ALL)
+        self.next_button.setVisible(self.view_mode != VIEW_ALL)
+
+        if at_latest:
             self.next_button.setEnabled(False)
             self.next_button.setStyleSheet("""
                 QPushButton {
@@ -193,13 +193,75 @@ class CalendarWidget(QWidget):
                 }
             """)
 
+    def _shift_month(self, year: int, month: int, delta: int):
+        index = year * 12 + (month - 1) + delta
+        return index // 12, index % 12 + 1
+
+    def set_view_mode(self, mode: str):
+        if mode == self.view_mode:
+            return
+        QToolTip.hideText()
+        self.view_mode = mode
+        if mode == VIEW_MONTH:
+            self.calendar_stack.setCurrentWidget(self.calendar_grid)
+        else:
+            self.calendar_stack.setCurrentWidget(self.heatmap_scroll)
+        self.update_calendar_nav_buttons()
+        self.refresh_calendar()
+
+    def show_current_period(self):
+        # Back to the month or year containing today, keeping the view mode.
+        self.current_date = self.streak_manager.get_today().replace(day=1)
+        self.displayed_date = self.current_date
+        self.displayed_year = self.current_date.year
+        self.update_calendar_nav_buttons()
+        self.refresh_calendar()
+
+    def _update_period_label(self):
+        if self.view_mode == VIEW_MONTH:
+            self.month_label.setText(self.displayed_date.strftime("%B %Y"))
+        elif self.view_mode == VIEW_YEAR:
+            self.month_label.setText(str(self.displayed_year))
+        else:
+            self.month_label.setText("All time")
+
+    def show_previous(self):
+        if self.view_mode == VIEW_MONTH:
+            self.show_previous_month()
+        elif self.view_mode == VIEW_YEAR:
+            self.displayed_year -= 1
+            self.update_calendar_nav_buttons()
+            self.refresh_calendar()
+
+    def show_next(self):
+        if self.view_mode == VIEW_MONTH:
+            self.show_next_month()
+        elif self.view_mode == VIEW_YEAR:
+            self.displayed_year += 1
+            self.update_calendar_nav_buttons()
+            self.refresh_calendar()
+
+    def refresh_calendar(self):
+        self._update_period_label()
+        if self.view_mode == VIEW_MONTH:
+            self.refresh_calendar_grid()
+        else:
+            self.refresh_year_heatmap()
+
+    def refresh_year_heatmap(self):
+        day_index = self.streak_manager.get_day_index()
+        today = self.streak_manager.get_today()
+        if self.view_mode == VIEW_YEAR:
+            years = [self.displayed_year]
+        else:
+            first_year = date.fromordinal(day_index.active[0]).year if day_index.active else today.year
+            years = list(range(today.year, first_year - 1, -1))
+        self.year_heatmap.set_years(years, day_index, today.toordinal(),
+                                    self.streak_manager.get_day_index_version())
+
     def show_previous_month(self):
         QToolTip.hideText()
-        year = self.displayed_date.year
-        month = self.displayed_date.month - 1
-        if month == 0:
-            month = 12
-            year -= 1
+        year, month = self._shift_month(self.displayed_date.year, self.displayed_date.month, -1)
         self.displayed_date = self.displayed_date.replace(year=year, month=month)
         self.month_label.setText(self.displayed_date.strftime("%B %Y"))
         self.update_calendar_nav_buttons()
@@ -207,85 +269,101 @@ class CalendarWidget(QWidget):
 
     def show_next_month(self):
         QToolTip.hideText()
-        year = self.displayed_date.year
-        month = self.displayed_date.month + 1
-        if month == 13:
-            month = 1
-            year += 1
+        year, month = self._shift_month(self.displayed_date.year, self.displayed_date.month, 1)
         self.displayed_date = self.displayed_date.replace(year=year, month=month)
         self.month_label.setText(self.displayed_date.strftime("%B %Y"))
         self.update_calendar_nav_buttons()
         self.refresh_calendar_grid()
 
     def refresh_calendar_grid(self):
-        all_reviewed_dates = self.streak_manager.streak_history.get_streak_days()
-        consumed_freeze_dates = set(self.streak_manager.get_consumed_freeze_dates())
-
-        year = self.displayed_date.year
-        month = self.displayed_date.month
+        self.calendar_grid.set_cells(self._get_month_cells(self.displayed_date.year, self.displayed_date.month))
+        QTimer.singleShot(0, self._prefetch_adjacent_months)
+
+    def _get_month_cells(self, year: int, month: int) -> list:
+        # Cells are cached per month and rebuilt once the streak days, the
+        # month's review totals or the current day change.
+        def version():
+            return (
+                self.streak_manager.get_day_index_version(),
+                self.streak_manager.review_stats.month_version(year, month),
+                self.streak_manager.get_today().toordinal(),
+            )
+
+        cached = self._month_cells.get((year, month))
+        if cached is None or cached[0] != version():
+            cells = self._build_month_cells(year, month)
+            # Read after the build, which caches the month's totals.
+            cached = (version(), cells)
+            self._month_cells[(year, month)] = cached
+        return cached[1]
+
+    def _prefetch_adjacent_months(self):
+        year, month = self.displayed_date.year, self.displayed_date.month
+        today = self.streak_manager.get_today()
+        for delta in (-1, 1):
+            adjacent_year, adjacent_month = self._shift_month(year, month, delta)
+            if (adjacent_year, adjacent_month) <= (today.year, today.month):
+                self._get_month_cells(adjacent_year, adjacent_month)
+
+    def _build_month_cells(self, year: int, month: int) -> list:
+        day_index = self.streak_manager.get_day_index()
+
+        review_totals = self.streak_manager.get_review_totals_for_month(year, month)
+        max_reviews = max((totals[0] for totals in review_totals.values()), default=0)
 
         cal = calendar.Calendar(firstweekday=calendar.MONDAY)
         month_days = cal.monthdayscalendar(year, month)
 
-        today_str = date.today().strftime("%Y-%m-%d")
+        today_ordinal = self.streak_manager.get_today().toordinal()
 
-        for label in self.day_labels:
-            label.setText("")
-            if hasattr(label, '_associated_date'):
-                del label._associated_date
-            label.setStyleSheet("background-color: transparent; color: white; padding: 6px; border-radius: 10px; font-size: 20px;")
-
-        label_index = 0
+        cells = [None] * (CalendarGrid.COLUMNS * CalendarGrid.ROWS)
+        cell_index = 0
         for week in month_days:
             for day in week:
                 if day != 0:
-                    label = self.day_labels[label_index]
-                    label.setText(str(day))
+                    day_date = date(year, month, day)
+                    day_ordinal = day_date.toordinal()
+
+                    is_reviewed_day = day_index.is_reviewed(day_ordinal)
+                    is_freeze_day = day_index.is_frozen(day_ordinal)
+                    is_today = day_ordinal == today_ordinal
 
-                    current_day_date_str = f"{year:04d}-{month:02d}-{day:02d}"
-                    label._associated_date = date(year, month, day)
+                    review_count = review_totals.get(day_ordinal, (0, 0))[0]
+                    intensity = self._get_intensity_level(review_count, max_reviews)
 
-                    is_reviewed_day = current_day_date_str in all_reviewed_dates
-                    is_freeze_day = current_day_date_str in consumed_freeze_dates
-                    is_today = current_day_date_str == today_str
+                    cells[cell_index] = self._get_day_cell(day_date, is_today, is_reviewed_day, is_freeze_day, intensity)
 
-                    label.setStyleSheet(self._get_day_label_stylesheet(is_today, is_reviewed_day, is_freeze_day))
-                    label.mousePressEvent = lambda event, lbl=label: self._on_day_label_clicked(event, lbl)
+                cell_index += 1
+        return cells
 
-                label_index += 1
+    def _get_intensity_level(self, review_count: int, max_reviews: int) -> int:
+        if max_reviews <= 0:
+            return 2
+        return max(0, min(len(REVIEWED_DAY_COLORS) - 1, (review_count * len(REVIEWED_DAY_COLORS) - 1) // max_reviews))
 
-    def _get_day_label_stylesheet(self, is_today: bool, is_reviewed_day: bool, is_freeze_day: bool) -> str:
-        base_style = "color: white; font-weight: bold; border-radius: 10px; padding: 6px; font-size: 20px;"
-        today_font_size = "22px"
+    def _get_day_cell(self, day_date: date, is_today: bool, is_reviewed_day: bool, is_freeze_day: bool, intensity: int = 2) -> DayCell:
+        today_font_size = 22
 
         if is_today:
             if is_reviewed_day:
-                return f"background-color: #F47C00; color: black; font-weight: bold; border-radius: 10px; padding: 6px; font-size: {today_font_size};"
+                return DayCell(day_date, "#F47C00", "black", font_size=today_font_size)
             elif is_freeze_day:
-                return f"background-color: #5bb3ff; color: black; font-weight: bold; border-radius: 10px; padding: 6px; border: 5px solid #80D3FF; font-size: {today_font_size};"
+                return DayCell(day_date, "#5bb3ff", "black", "#80D3FF", 5, font_size=today_font_size)
             else:
-                return f"background-color: #545454; color: white; font-weight: bold; border-radius: 10px; padding: 6px; border: 1px solid #999999; font-size: {today_font_size};"
+                return DayCell(day_date, "#545454", "white", "#999999", 1, font_size=today_font_size)
         elif is_reviewed_day:
-            return f"background-color: #D67E00; color: black; font-weight: bold; border-radius: 10px; padding: 6px; font-size: 22px;"
+            return DayCell(day_date, REVIEWED_DAY_COLORS[intensity], "black", font_size=22)
         elif is_freeze_day:
-            return f"background-color: #44B1F9; color: white; font-weight: bold; border-radius: 10px; padding: 6px; border: 5px solid #80D3FF; font-size: 20px;"
+            return DayCell(day_date, "#44B1F9", "white", "#80D3FF", 5, font_size=20)
         else:
-            return base_style
-
-    def _on_day_label_clicked(self, event: QMouseEvent, label: QLabel):
-        if event.button() == QtCoreQt.MouseButton.LeftButton:
-            if hasattr(label, '_associated_date'):
-                selected_date = label._associated_date # Get selected_date here
-
-                # Get the global position of the label
-                global_pos = label.mapToGlobal(QPoint(0, 0))
-                # Calculate the center of the label
-                center_x = global_pos.x() + label.width() // 2
-                center_y = global_pos.y() + label.height() // 2
-
-                popup = DayDetailsPopup(self.streak_manager, selected_date, self)
-                # Position the popup above the clicked label
-                popup_x = center_x - popup.width() // 2
-                popup_y = global_pos.y() - popup.height() - 10 # 10 pixels above the label
-                popup.move(popup_x, popup_y)
-                popup.exec()
+            return DayCell(day_date)
+
+    def _on_day_clicked(self, selected_date: date, cell_rect: QRect):
+        center_x = cell_rect.x() + cell_rect.width() // 2
+
+        popup = DayDetailsPopup(self.streak_manager, selected_date, self)
+        # Position the popup above the clicked day
+        popup_x = center_x - popup.width() // 2
+        popup_y = cell_rect.y() - popup.height() - 10 # 10 pixels above the day
+        popup.move(popup_x, popup_y)
+        popup.exec()
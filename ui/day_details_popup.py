@@ -2,12 +2,14 @@ import re
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QScrollArea, QWidget, QPushButton, QHBoxLayout
 from PyQt6.QtCore import Qt
 from datetime import date
+from ..logic.review_stats import DayReviewStats
 
 class DayDetailsPopup(QDialog):
-    def __init__(self, streak_manager, selected_date: date, parent=None):
+    def __init__(self, streak_manager, selected_date: date, parent=None, stats: DayReviewStats = None):
         super().__init__(parent)
         self.streak_manager = streak_manager
         self.selected_date = selected_date
+        self.stats = stats if stats is not None else streak_manager.get_day_review_stats(selected_date)
 
         self.setWindowTitle(f"Details for {selected_date.strftime('%Y-%m-%d')}")
         self.setWindowFlags(Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint)
@@ -72,10 +74,8 @@ class DayDetailsPopup(QDialog):
         main_layout.setContentsMargins(10, 5, 10, 10)
         main_layout.setSpacing(5)
 
-        details_for_totals = self.streak_manager.get_review_details_for_date(self.selected_date)
-        total_reviews = sum(data['reviews'] for data in details_for_totals.values()) if details_for_totals else 0
-        total_time_ms = sum(data['time_spent_ms'] for data in details_for_totals.values()) if details_for_totals else 0
-        total_time_min = round(total_time_ms / 60000, 1)
+        total_reviews = self.stats.reviews
+        total_time_min = round(self.stats.time_spent_ms / 60000, 1)
 
         header_layout = QHBoxLayout()
         header_layout.setContentsMargins(0, 0, 0, 0)
@@ -142,7 +142,7 @@ class DayDetailsPopup(QDialog):
         return label
 
     def _load_review_details(self):
-        details = self.streak_manager.get_review_details_for_date(self.selected_date)
+        details = self.stats.as_details()
 
         if not details:
             no_reviews_label = self._create_label("", alignment=Qt.AlignmentFlag.AlignCenter)
@@ -1,9 +1,7 @@
-import base64
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar, QHBoxLayout
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
 from aqt import mw
-from ..ui.icon import get_base64_icon_data
+from ..ui.icon import get_icon_pixmap
 from ..logic.streak_manager import get_streak_manager
 
 class FreezePopup(QDialog):
@@ -24,7 +22,7 @@ class FreezePopup(QDialog):
         freeze_display_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         icon_label = QLabel()
-        icon_label.setPixmap(self._load_and_scale_icon(get_base64_icon_data("frozen_streak")))
+        icon_label.setPixmap(get_icon_pixmap("frozen_streak", 64))
         icon_label.setFixedSize(64, 64)
         icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -54,12 +52,6 @@ class FreezePopup(QDialog):
 
         self.setLayout(layout)
 
-    def _load_and_scale_icon(self, icon_data_uri: str) -> QPixmap:
-        pixmap = QPixmap()
-        pixmap.loadFromData(base64.b64decode(icon_data_uri.split(",")[1]))
-        scaled_pixmap = pixmap.scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        return scaled_pixmap
-
 def open_freeze_popup(mw=None):
     if mw is None:
         mw = AnkiQt.mw
@@ -12,12 +12,56 @@ ICON_FILENAMES = {
     "x": "./icons/xIcon.png",
 }
 
-def get_base64_icon_data(icon_name: str) -> str:
+# icon name -> {"mtime", "bytes", "data_uri", "pixmaps"}. Entries are filled
+# lazily and dropped as soon as the file's modification time changes.
+_icon_cache = {}
+
+
+def _get_cache_entry(icon_name: str) -> dict:
     filename = ICON_FILENAMES.get(icon_name)
     if not filename:
         raise ValueError(f"Unknown icon name: {icon_name}")
 
     icon_path = os.path.join(os.path.dirname(__file__), "..", filename)
-    with open(icon_path, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode("ascii")
-    return f"data:image/png;base64,{encoded}"
\ No newline at end of file
+    mtime = os.stat(icon_path).st_mtime_ns
+
+    entry = _icon_cache.get(icon_name)
+    if entry is None or entry["mtime"] != mtime:
+        with open(icon_path, "rb") as f:
+            entry = {"mtime": mtime, "bytes": f.read(), "data_uri": None, "pixmaps": {}}
+        _icon_cache[icon_name] = entry
+    return entry
+
+
+def get_icon_bytes(icon_name: str) -> bytes:
+    return _get_cache_entry(icon_name)["bytes"]
+
+
+def get_base64_icon_data(icon_name: str) -> str:
+    entry = _get_cache_entry(icon_name)
+    if entry["data_uri"] is None:
+        encoded = base64.b64encode(entry["bytes"]).decode("ascii")
+        entry["data_uri"] = f"data:image/png;base64,{encoded}"
+    return entry["data_uri"]
+
+
+def get_icon_pixmap(icon_name: str, size: int = None, device_pixel_ratio: float = 1.0):
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QPixmap
+
+    # With a ratio above 1 the pixmap is scaled to size * ratio device pixels
+    # and still lays out as `size` logical pixels, so it stays sharp on HiDPI
+    # screens without Qt rescaling it on every paint.
+    entry = _get_cache_entry(icon_name)
+    key = (size, device_pixel_ratio)
+    pixmap = entry["pixmaps"].get(key)
+    if pixmap is None:
+        pixmap = QPixmap()
+        pixmap.loadFromData(entry["bytes"])
+        if size is not None:
+            device_size = round(size * device_pixel_ratio)
+            pixmap = pixmap.scaled(device_size, device_size, Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+        entry["pixmaps"][key] = pixmap
+    return pixmap
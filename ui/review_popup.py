@@ -1,217 +1,164 @@
-import base64
 from PyQt6.QtCore import (
-    Qt as QtCoreQt, QPropertyAnimation, QEasingCurve, QObject,
-    pyqtProperty, QTimer, QPoint, pyqtSignal, QParallelAnimationGroup, QSequentialAnimationGroup
+    Qt as QtCoreQt, QPropertyAnimation, QEasingCurve,
+    pyqtProperty, QTimer, QPoint, QRectF, QParallelAnimationGroup, QSequentialAnimationGroup
 )
-from PyQt6.QtGui import QPixmap, QFont, QColor
+from PyQt6.QtGui import QFont, QColor, QPainter
 from PyQt6.QtWidgets import QDialog, QLabel, QVBoxLayout, QWidget, QPushButton, QGraphicsOpacityEffect
 
-from .icon import get_base64_icon_data
-from ..logic.streak_manager import get_streak_manager
-
-
-class ColorPropertyAnimator(QObject):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._color = QColor()
-
-    def get_color(self):
-        return self._color
-
-    def set_color(self, color):
-        self._color = color
-
-    color = pyqtProperty(QColor, get_color, set_color)
-
-
-class IntPropertyAnimator(QObject):
-    animated_valueChanged = pyqtSignal(int)
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._value = 0
-
-    def get_value(self):
-        return self._value
-
-    def set_value(self, value):
-        if self._value != value:
-            self._value = value
-            self.animated_valueChanged.emit(value)
-
-    animated_value = pyqtProperty(int, get_value, set_value)
+from .icon import get_icon_pixmap
 
 
 class IconAnimationWidget(QWidget):
+    ICON_SIZE = 80
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setFixedSize(80, 80)
+        self.setFixedSize(self.ICON_SIZE, self.ICON_SIZE)
         self.setContentsMargins(0, 0, 0, 0)
+        self._pixmap_ratio = None
 
         self.grey_icon_label = QLabel(self)
-        self.grey_icon_label.setPixmap(self._load_and_scale_icon(get_base64_icon_data("grey_streak")))
-        self.grey_icon_label.setGeometry(0, 0, 80, 80)
+        self.grey_icon_label.setGeometry(0, 0, self.ICON_SIZE, self.ICON_SIZE)
         self.grey_icon_label.setAlignment(QtCoreQt.AlignmentFlag.AlignCenter)
 
         self.orange_icon_label = QLabel(self)
-        self.orange_icon_label.setPixmap(self._load_and_scale_icon(get_base64_icon_data("streak")))
-        self.orange_icon_label.setGeometry(0, 0, 80, 80)
+        self.orange_icon_label.setGeometry(0, 0, self.ICON_SIZE, self.ICON_SIZE)
         self.orange_icon_label.setAlignment(QtCoreQt.AlignmentFlag.AlignCenter)
-        self.orange_icon_label.hide()
 
         self.orange_icon_opacity_effect = QGraphicsOpacityEffect(self.orange_icon_label)
         self.orange_icon_label.setGraphicsEffect(self.orange_icon_opacity_effect)
-        self.orange_icon_opacity_effect.setOpacity(0.0)
 
         self.grey_icon_opacity_effect = QGraphicsOpacityEffect(self.grey_icon_label)
         self.grey_icon_label.setGraphicsEffect(self.grey_icon_opacity_effect)
-        self.grey_icon_opacity_effect.setOpacity(1.0)
 
-    def _load_and_scale_icon(self, icon_data_uri: str) -> QPixmap:
-        pixmap = QPixmap()
-        pixmap.loadFromData(base64.b64decode(icon_data_uri.split(",")[1]))
-        scaled_pixmap = pixmap.scaled(80, 80, QtCoreQt.AspectRatioMode.KeepAspectRatio,
-                                      QtCoreQt.TransformationMode.SmoothTransformation)
-        return scaled_pixmap
-
-    def get_icon_fade_animation_group(self):
-        grey_icon_fade_out_animation = QPropertyAnimation(self.grey_icon_opacity_effect, b"opacity")
+        grey_icon_fade_out_animation = QPropertyAnimation(self.grey_icon_opacity_effect, b"opacity", self)
         grey_icon_fade_out_animation.setDuration(1000)
         grey_icon_fade_out_animation.setStartValue(1.0)
         grey_icon_fade_out_animation.setEndValue(0.0)
         grey_icon_fade_out_animation.finished.connect(self.grey_icon_label.hide)
 
-        self.orange_icon_label.show()
-        self.orange_icon_label.raise_()
-        orange_icon_fade_in_animation = QPropertyAnimation(self.orange_icon_opacity_effect, b"opacity")
+        orange_icon_fade_in_animation = QPropertyAnimation(self.orange_icon_opacity_effect, b"opacity", self)
         orange_icon_fade_in_animation.setDuration(1000)
         orange_icon_fade_in_animation.setStartValue(0.0)
         orange_icon_fade_in_animation.setEndValue(1.0)
 
-        icon_fade_group = QParallelAnimationGroup()
-        icon_fade_group.addAnimation(grey_icon_fade_out_animation)
-        icon_fade_group.addAnimation(orange_icon_fade_in_animation)
-        return icon_fade_group
+        self.icon_fade_group = QParallelAnimationGroup(self)
+        self.icon_fade_group.addAnimation(grey_icon_fade_out_animation)
+        self.icon_fade_group.addAnimation(orange_icon_fade_in_animation)
 
+        self.reset()
 
-class NumberAnimationWidget(QWidget):
-    animation_finished = pyqtSignal()
+    def _update_pixmaps(self):
+        # Icons are scaled once per screen pixel ratio and reused.
+        ratio = self.devicePixelRatioF()
+        if ratio == self._pixmap_ratio:
+            return
+        self._pixmap_ratio = ratio
+        self.grey_icon_label.setPixmap(get_icon_pixmap("grey_streak", self.ICON_SIZE, ratio))
+        self.orange_icon_label.setPixmap(get_icon_pixmap("streak", self.ICON_SIZE, ratio))
+
+    def reset(self):
+        self._update_pixmaps()
+        self.grey_icon_opacity_effect.setOpacity(1.0)
+        self.grey_icon_label.show()
+        self.orange_icon_opacity_effect.setOpacity(0.0)
+        self.orange_icon_label.show()
+        self.orange_icon_label.raise_()
 
-    def __init__(self, parent=None, previous_streak=0, current_streak=0):
+
+class NumberAnimationWidget(QWidget):
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(250, 60)
-        self.previous_streak = previous_streak
-        self.current_streak = current_streak
 
         self.effective_right_margin = 20
         self.content_width = self.width() - self.effective_right_margin
+        self.label_x = (self.width() - self.content_width) // 2
 
-        self.old_streak_number_label = QLabel(str(self.previous_streak) + "  ", self)
-        self.new_streak_number_label = QLabel(str(self.current_streak) + "  ", self)
+        self.old_streak_number_label = QLabel(self)
+        self.new_streak_number_label = QLabel(self)
 
         number_font = QFont("Arial", 48, QFont.Weight.Bold)
         for lbl in [self.old_streak_number_label, self.new_streak_number_label]:
             lbl.setFont(number_font)
             lbl.setStyleSheet("color: white;")
             lbl.setAlignment(QtCoreQt.AlignmentFlag.AlignCenter)
-            lbl.setGeometry(
-                (self.width() - self.content_width) // 2,
-                0,
-                self.content_width,
-                self.height()
-            )
-
-        self.old_streak_number_label.show()
-        self.new_streak_number_label.hide()
+            lbl.setGeometry(self.label_x, 0, self.content_width, self.height())
 
         self.old_number_opacity_effect = QGraphicsOpacityEffect(self.old_streak_number_label)
         self.old_streak_number_label.setGraphicsEffect(self.old_number_opacity_effect)
-        self.old_number_opacity_effect.setOpacity(1.0)
 
         self.new_number_opacity_effect = QGraphicsOpacityEffect(self.new_streak_number_label)
         self.new_streak_number_label.setGraphicsEffect(self.new_number_opacity_effect)
-        self.new_number_opacity_effect.setOpacity(0.0)
-
-        self.old_streak_number_label.repaint()
-        self.new_streak_number_label.repaint()
-
-    def get_number_animation_group(self):
-        if self.previous_streak != self.current_streak:
-            self.new_streak_number_label.hide()
-            self.new_streak_number_label.move(self.new_streak_number_label.x(), -self.height())
-
-            common_easing_curve = QEasingCurve.Type.OutQuad
-
-            self.old_number_pos_animation = QPropertyAnimation(self.old_streak_number_label, b"pos")
-            self.old_number_pos_animation.setDuration(1000)
-            self.old_number_pos_animation.setStartValue(QPoint(self.old_streak_number_label.x(), 0))
-            self.old_number_pos_animation.setEndValue(QPoint(self.old_streak_number_label.x(), self.height()))
-            self.old_number_pos_animation.setEasingCurve(common_easing_curve)
-            self.old_number_pos_animation.finished.connect(self.old_streak_number_label.hide)
-
-            self.old_number_opacity_animation = QPropertyAnimation(self.old_number_opacity_effect, b"opacity")
-            self.old_number_opacity_animation.setDuration(1000)
-            self.old_number_opacity_animation.setStartValue(1.0)
-            self.old_number_opacity_animation.setEndValue(0.0)
-            self.old_number_opacity_animation.setEasingCurve(QEasingCurve.Type.OutQuad)
-
-            old_number_group = QParallelAnimationGroup()
-            old_number_group.addAnimation(self.old_number_pos_animation)
-            old_number_group.addAnimation(self.old_number_opacity_animation)
-
-            self.new_number_pos_animation = QPropertyAnimation(self.new_streak_number_label, b"pos")
-            self.new_number_pos_animation.setDuration(1000)
-            self.new_number_pos_animation.setStartValue(QPoint(self.new_streak_number_label.x(), -self.height()))
-            self.new_number_pos_animation.setEndValue(QPoint(self.new_streak_number_label.x(), 0))
-            self.new_number_pos_animation.setEasingCurve(common_easing_curve)
-
-            self.new_number_opacity_animation = QPropertyAnimation(self.new_number_opacity_effect, b"opacity")
-            self.new_number_opacity_animation.setDuration(1000)
-            self.new_number_opacity_animation.setStartValue(0.0)
-            self.new_number_opacity_animation.setEndValue(1.0)
-            self.new_number_opacity_animation.setEasingCurve(QEasingCurve.Type.OutQuad)
-
-            new_number_group = QParallelAnimationGroup()
-            new_number_group.addAnimation(self.new_number_pos_animation)
-            new_number_group.addAnimation(self.new_number_opacity_animation)
-
-            self.new_streak_number_label.show()
-
-            number_slide_group = QParallelAnimationGroup()
-            number_slide_group.addAnimation(old_number_group)
-            number_slide_group.addAnimation(new_number_group)
-
-            return number_slide_group
 
+        common_easing_curve = QEasingCurve.Type.OutQuad
+
+        self.old_number_pos_animation = QPropertyAnimation(self.old_streak_number_label, b"pos", self)
+        self.old_number_pos_animation.setDuration(1000)
+        self.old_number_pos_animation.setStartValue(QPoint(self.label_x, 0))
+        self.old_number_pos_animation.setEndValue(QPoint(self.label_x, self.height()))
+        self.old_number_pos_animation.setEasingCurve(common_easing_curve)
+        self.old_number_pos_animation.finished.connect(self.old_streak_number_label.hide)
+
+        self.old_number_opacity_animation = QPropertyAnimation(self.old_number_opacity_effect, b"opacity", self)
+        self.old_number_opacity_animation.setDuration(1000)
+        self.old_number_opacity_animation.setStartValue(1.0)
+        self.old_number_opacity_animation.setEndValue(0.0)
+        self.old_number_opacity_animation.setEasingCurve(QEasingCurve.Type.OutQuad)
+
+        self.new_number_pos_animation = QPropertyAnimation(self.new_streak_number_label, b"pos", self)
+        self.new_number_pos_animation.setDuration(1000)
+        self.new_number_pos_animation.setEndValue(QPoint(self.label_x, 0))
+        self.new_number_pos_animation.setEasingCurve(common_easing_curve)
+
+        self.new_number_opacity_animation = QPropertyAnimation(self.new_number_opacity_effect, b"opacity", self)
+        self.new_number_opacity_animation.setDuration(1000)
+        self.new_number_opacity_animation.setEndValue(1.0)
+        self.new_number_opacity_animation.setEasingCurve(QEasingCurve.Type.OutQuad)
+
+        self.number_slide_group = QParallelAnimationGroup(self)
+        for animation in (self.old_number_pos_animation, self.old_number_opacity_animation,
+                          self.new_number_pos_animation, self.new_number_opacity_animation):
+            self.number_slide_group.addAnimation(animation)
+
+    def set_streaks(self, previous_streak: int, current_streak: int):
+        # Rewinds the labels and the slide animations for a new run. When the
+        # number doesn't change the new label just sits in place.
+        self.old_streak_number_label.setText(str(previous_streak) + "  ")
+        self.new_streak_number_label.setText(str(current_streak) + "  ")
+
+        if previous_streak != current_streak:
+            self.old_streak_number_label.move(self.label_x, 0)
+            self.old_number_opacity_effect.setOpacity(1.0)
+            self.old_streak_number_label.show()
+            new_start = QPoint(self.label_x, -self.height())
+            new_start_opacity = 0.0
         else:
             self.old_streak_number_label.hide()
-            self.new_streak_number_label.setGeometry(
-                (self.width() - self.content_width) // 2,
-                0,
-                self.content_width,
-                self.height()
-            )
-            self.new_streak_number_label.show()
-            self.new_number_opacity_effect.setOpacity(1.0)
-
-            dummy_animation = QPropertyAnimation(self, b"pos")
-            dummy_animation.setDuration(1)
-            dummy_animation.setStartValue(QPoint(0, 0))
-            dummy_animation.setEndValue(QPoint(0, 0))
-            return dummy_animation
+            new_start = QPoint(self.label_x, 0)
+            new_start_opacity = 1.0
 
+        self.new_number_pos_animation.setStartValue(new_start)
+        self.new_number_opacity_animation.setStartValue(new_start_opacity)
+        self.new_streak_number_label.move(new_start)
+        self.new_number_opacity_effect.setOpacity(new_start_opacity)
+        self.new_streak_number_label.show()
 
+
+# Built once and replayed for every first review of the day: widgets, scaled
+# icons and the animation graph are all kept, and play() only rewinds them.
 class StreakAnimationPopup(QDialog):
-    def __init__(self, parent=None, previous_streak=0, current_streak=0):
+    START_COLOR = QColor("#2e2e2e")
+    END_COLOR = QColor("#d67e00")
+
+    def __init__(self, parent=None):
         super().__init__(parent, QtCoreQt.WindowType.SplashScreen | QtCoreQt.WindowType.FramelessWindowHint)
-        self.setAttribute(QtCoreQt.WidgetAttribute.WA_DeleteOnClose)
         self.setWindowModality(QtCoreQt.WindowModality.NonModal)
         self.setFixedSize(250, 250)
 
-        self.previous_streak = previous_streak
-        self.current_streak = current_streak
-
-        self.setStyleSheet("background-color: #2e2e2e; border-radius: 15px;")
+        # The background is painted directly rather than through a
+        # stylesheet, so animating it doesn't restyle every child per frame.
+        self._background_color = QColor(self.START_COLOR)
 
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
@@ -226,9 +173,7 @@ class StreakAnimationPopup(QDialog):
 
         main_layout.addSpacing(15)
 
-        self.number_animation_widget = NumberAnimationWidget(self,
-                                                             previous_streak=self.previous_streak,
-                                                             current_streak=self.current_streak)
+        self.number_animation_widget = NumberAnimationWidget(self)
         main_layout.addWidget(self.number_animation_widget, alignment=QtCoreQt.AlignmentFlag.AlignCenter)
 
         main_layout.addSpacing(5)
@@ -261,45 +206,75 @@ class StreakAnimationPopup(QDialog):
 
         self.button_opacity_effect = QGraphicsOpacityEffect(self.great_button)
         self.great_button.setGraphicsEffect(self.button_opacity_effect)
-        self.button_opacity_effect.setOpacity(0.0)
 
         main_layout.addWidget(self.great_button, alignment=QtCoreQt.AlignmentFlag.AlignCenter)
 
         self.setLayout(main_layout)
 
-        QTimer.singleShot(10, self._start_initial_animations)
-
-    def _update_background_color(self, color: QColor):
-        self.setStyleSheet(f"background-color: {color.name()}; border-radius: 15px;")
-
-    def _start_initial_animations(self):
-        self.color_animator = ColorPropertyAnimator(self)
-        self.background_animation = QPropertyAnimation(self.color_animator, b"color")
+        self.background_animation = QPropertyAnimation(self, b"background_color", self)
         self.background_animation.setDuration(1000)
-        self.background_animation.setStartValue(QColor("#2e2e2e"))
-        self.background_animation.setEndValue(QColor("#d67e00"))
+        self.background_animation.setStartValue(self.START_COLOR)
+        self.background_animation.setEndValue(self.END_COLOR)
         self.background_animation.setEasingCurve(QEasingCurve.Type.OutQuad)
-        self.background_animation.valueChanged.connect(self._update_background_color)
 
-        icon_fade_group = self.icon_animation_widget.get_icon_fade_animation_group()
-
-        number_animation_group = self.number_animation_widget.get_number_animation_group()
-
-        initial_parallel_animations = QParallelAnimationGroup()
-        initial_parallel_animations.addAnimation(icon_fade_group)
+        initial_parallel_animations = QParallelAnimationGroup(self)
+        initial_parallel_animations.addAnimation(self.icon_animation_widget.icon_fade_group)
         initial_parallel_animations.addAnimation(self.background_animation)
-        initial_parallel_animations.addAnimation(number_animation_group)
+        initial_parallel_animations.addAnimation(self.number_animation_widget.number_slide_group)
 
-        self.master_sequence = QSequentialAnimationGroup()
+        self.button_opacity_animation = QPropertyAnimation(self.button_opacity_effect, b"opacity", self)
+        self.button_opacity_animation.setDuration(400)
+        self.button_opacity_animation.setStartValue(0.0)
+        self.button_opacity_animation.setEndValue(1.0)
+
+        self.master_sequence = QSequentialAnimationGroup(self)
         self.master_sequence.addAnimation(initial_parallel_animations)
+        self.master_sequence.addAnimation(self.button_opacity_animation)
 
-        self.master_sequence.finished.connect(self._show_great_button)
+        self._start_timer = QTimer(self)
+        self._start_timer.setSingleShot(True)
+        self._start_timer.timeout.connect(self.master_sequence.start)
 
-        QTimer.singleShot(300, self.master_sequence.start)
+    def get_background_color(self):
+        return self._background_color
 
-    def _show_great_button(self):
-        self.button_opacity_animation = QPropertyAnimation(self.button_opacity_effect, b"opacity")
-        self.button_opacity_animation.setDuration(400)
-        self.button_opacity_animation.setStartValue(0.0)
-        self.button_opacity_animation.setEndValue(1.0)
-        self.button_opacity_animation.start()
+    def set_background_color(self, color):
+        self._background_color = QColor(color)
+        self.update()
+
+    background_color = pyqtProperty(QColor, get_background_color, set_background_color)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QtCoreQt.PenStyle.NoPen)
+        painter.setBrush(self._background_color)
+        painter.drawRoundedRect(QRectF(self.rect()), 15, 15)
+        painter.end()
+
+    def play(self, previous_streak: int, current_streak: int):
+        self._start_timer.stop()
+        self.master_sequence.stop()
+
+        self.set_background_color(self.START_COLOR)
+        self.button_opacity_effect.setOpacity(0.0)
+        self.icon_animation_widget.reset()
+        self.number_animation_widget.set_streaks(previous_streak, current_streak)
+
+        self.show()
+        self.raise_()
+        self._start_timer.start(310)
+
+
+_animation_popup = None
+
+
+def prepare_streak_animation_popup(parent) -> StreakAnimationPopup:
+    global _animation_popup
+    if _animation_popup is None or _animation_popup.parent() is not parent:
+        _animation_popup = StreakAnimationPopup(parent)
+    return _animation_popup
+
+
+def show_streak_animation_popup(parent, previous_streak: int, current_streak: int):
+    prepare_streak_animation_popup(parent).play(previous_streak, current_streak)
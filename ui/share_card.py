@@ -0,0 +1,168 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QIODevice, QRectF
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter
+
+from .icon import get_icon_bytes
+
+# The shareable streak card, drawn with QPainter onto a QImage. Unlike a
+# QPixmap or a widget render this works off the GUI thread, so the card can
+# be prepared in the background as soon as the share dialog opens.
+
+CARD_SIZE = 250
+CARD_MARGIN = 15
+CARD_RADIUS = 15
+ICON_SIZE = 80
+
+# Defaults for the add-on config's share_image_scale and
+# share_image_quality; see share_image_settings.
+SHARE_IMAGE_SCALE = 2
+MAX_SHARE_IMAGE_SCALE = 4
+# Format -> (file extensions, quality passed to QImage.save). For PNG the
+# quality sets the zlib level (lower is smaller and slower); for WebP and
+# JPEG it is the usual lossy quality.
+SHARE_IMAGE_FORMATS = {
+    "PNG": (("png",), 10),
+    "WEBP": (("webp",), 90),
+    "JPEG": (("jpg", "jpeg"), 92),
+}
+# JPEG has no alpha channel; the rounded corners are filled with this.
+JPEG_BACKGROUND = QColor("#2e2e2e")
+
+# (streak, reviewed_today, scale) -> QImage
+_card_cache = {}
+# (streak, reviewed_today, scale, format, quality) -> bytes
+_encoded_cache = {}
+# The dialog prepares the card on a worker thread while copy and save read it
+# on the GUI thread. Held across the render and encode, so a second caller
+# waits for the first one's result instead of producing its own.
+_cache_lock = threading.RLock()
+
+
+def share_image_settings(config: Optional[dict]) -> Tuple[int, Dict[str, int]]:
+    # (scale, format -> quality) from the add-on config. Missing or invalid
+    # values fall back to the defaults above.
+    config = config or {}
+    scale = config.get("share_image_scale", SHARE_IMAGE_SCALE)
+    if type(scale) is not int or not 1 <= scale <= MAX_SHARE_IMAGE_SCALE:
+        scale = SHARE_IMAGE_SCALE
+
+    qualities = {image_format: quality for image_format, (_, quality) in SHARE_IMAGE_FORMATS.items()}
+    configured = config.get("share_image_quality")
+    if isinstance(configured, dict):
+        for image_format, quality in configured.items():
+            image_format = str(image_format).upper()
+            if image_format in qualities and type(quality) is int and 0 <= quality <= 100:
+                qualities[image_format] = quality
+    return scale, qualities
+
+
+def _card_colors(reviewed_today: bool):
+    if reviewed_today:
+        return QColor("#d67e00"), QColor("white"), "streak"
+    return QColor("#545454"), QColor("#AAAAAA"), "grey_streak"
+
+
+def _bold_font(pixel_size: int) -> QFont:
+    font = QFont()
+    font.setPixelSize(pixel_size)
+    font.setBold(True)
+    return font
+
+
+def render_share_card(streak: int, reviewed_today: bool, scale: int = SHARE_IMAGE_SCALE) -> QImage:
+    background, text_color, icon_name = _card_colors(reviewed_today)
+
+    image = QImage(CARD_SIZE * scale, CARD_SIZE * scale, QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(scale)
+    image.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(image)
+    painter.setRenderHints(QPainter.RenderHint.Antialiasing
+                           | QPainter.RenderHint.TextAntialiasing
+                           | QPainter.RenderHint.SmoothPixmapTransform)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(background)
+    painter.drawRoundedRect(QRectF(0, 0, CARD_SIZE, CARD_SIZE), CARD_RADIUS, CARD_RADIUS)
+
+    number_font = _bold_font(95)
+    label_font = _bold_font(20)
+    number_height = QFontMetrics(number_font).height()
+    label_height = QFontMetrics(label_font).height()
+
+    # Icon, number and label stacked and centred vertically, as in the
+    # dialog's preview.
+    content_height = ICON_SIZE + number_height + label_height
+    y = (CARD_SIZE - content_height) / 2
+
+    icon = QImage.fromData(get_icon_bytes(icon_name))
+    icon_rect = QRectF((CARD_SIZE - ICON_SIZE) / 2, y, ICON_SIZE, ICON_SIZE)
+    painter.drawImage(icon_rect, icon)
+    y += ICON_SIZE
+
+    text_width = CARD_SIZE - 2 * CARD_MARGIN
+    painter.setPen(text_color)
+    painter.setFont(number_font)
+    painter.drawText(QRectF(CARD_MARGIN, y, text_width, number_height), Qt.AlignmentFlag.AlignCenter, str(streak))
+    y += number_height
+
+    painter.setFont(label_font)
+    painter.drawText(QRectF(CARD_MARGIN, y, text_width, label_height), Qt.AlignmentFlag.AlignCenter,
+                     "day streak in Anki!")
+    painter.end()
+    return image
+
+
+def get_share_card(streak: int, reviewed_today: bool, scale: int = SHARE_IMAGE_SCALE) -> QImage:
+    key = (streak, reviewed_today, scale)
+    with _cache_lock:
+        image = _card_cache.get(key)
+        if image is None:
+            image = render_share_card(streak, reviewed_today, scale)
+            # Only the card for the current streak is ever asked for again.
+            _card_cache.clear()
+            _encoded_cache.clear()
+            _card_cache[key] = image
+        return image
+
+
+def encode_share_card(streak: int, reviewed_today: bool, image_format: str = "PNG",
+                      scale: int = SHARE_IMAGE_SCALE, quality: Optional[int] = None) -> bytes:
+    if quality is None:
+        quality = SHARE_IMAGE_FORMATS[image_format][1]
+    key = (streak, reviewed_today, scale, image_format, quality)
+    with _cache_lock:
+        payload = _encoded_cache.get(key)
+        if payload is not None:
+            return payload
+
+        image = get_share_card(streak, reviewed_today, scale)
+        if image_format == "JPEG":
+            flattened = QImage(image.size(), QImage.Format.Format_RGB32)
+            # Same ratio as the card, or drawImage paints it at 1/scale size.
+            flattened.setDevicePixelRatio(image.devicePixelRatio())
+            flattened.fill(JPEG_BACKGROUND)
+            painter = QPainter(flattened)
+            painter.drawImage(0, 0, image)
+            painter.end()
+            image = flattened
+
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        if not image.save(buffer, image_format, quality):
+            raise ValueError(f"Could not encode share image as {image_format}")
+        buffer.close()
+
+        payload = bytes(data)
+        _encoded_cache[key] = payload
+        return payload
+
+
+def image_format_for_file(file_name: str) -> str:
+    extension = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+    for image_format, (extensions, _) in SHARE_IMAGE_FORMATS.items():
+        if extension in extensions:
+            return image_format
+    return "PNG"
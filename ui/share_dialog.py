@@ -1,15 +1,21 @@
-import base64
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
     QApplication, QWidget, QToolButton,
     QFileDialog, QToolTip
 )
 from PyQt6.QtCore import Qt, QUrl, QSize, QStandardPaths, QPoint, QRect
-from PyQt6.QtGui import QDesktopServices, QIcon, QPixmap, QPainter
+from PyQt6.QtGui import QDesktopServices, QIcon
+from aqt import mw
+from aqt.utils import showWarning
 
-from .icon import get_base64_icon_data
+from .icon import get_icon_pixmap
+from .share_card import (
+    SHARE_IMAGE_FORMATS, encode_share_card, get_share_card, image_format_for_file, share_image_settings
+)
 from ..logic.streak_manager import get_streak_manager
 
+SAVE_FILE_FILTERS = "PNG Image (*.png);;WebP Image (*.webp);;JPEG Image (*.jpg *.jpeg);;All Files (*)"
+
 
 class ShareDialog(QDialog):
     def __init__(self, parent=None):
@@ -26,14 +32,21 @@ class ShareDialog(QDialog):
             self.reviewed_today = False
             print(f"AnkiStreak: Error getting streak in ShareDialog: {e}")
 
+        try:
+            config = mw.addonManager.getConfig(__name__)
+        except Exception as e:
+            config = None
+            print(f"AnkiStreak: Error reading share image settings: {e}")
+        self.image_scale, self.image_qualities = share_image_settings(config)
+
         if self.reviewed_today:
             bg_color = "#d67e00"
             text_color = "white"
-            icon_data_uri = get_base64_icon_data("streak")
+            icon_name = "streak"
         else:
             bg_color = "#545454"
             text_color = "#AAAAAA"
-            icon_data_uri = get_base64_icon_data("grey_streak")
+            icon_name = "grey_streak"
 
         self.setStyleSheet(f"""
             ShareDialog {{
@@ -97,11 +110,7 @@ class ShareDialog(QDialog):
         visual_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.orange_icon_label = QLabel(self.streak_visual_section)
-        orange_pixmap = QPixmap()
-        orange_pixmap.loadFromData(base64.b64decode(icon_data_uri.split(",")[1]))
-        scaled_orange_pixmap = orange_pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                    Qt.TransformationMode.SmoothTransformation)
-        self.orange_icon_label.setPixmap(scaled_orange_pixmap)
+        self.orange_icon_label.setPixmap(get_icon_pixmap(icon_name, 80))
         self.orange_icon_label.setFixedSize(80, 80)
         self.orange_icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         visual_layout.addWidget(self.orange_icon_label, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -148,9 +157,7 @@ class ShareDialog(QDialog):
         copy_text_button.setText("Copy")
         copy_text_button.setFixedSize(110, 60)
         copy_text_button.setStyleSheet(tool_button_stylesheet)
-        copy_icon_pixmap = QPixmap()
-        copy_icon_pixmap.loadFromData(base64.b64decode(get_base64_icon_data("copy").split(",")[1]))
-        copy_text_button.setIcon(QIcon(copy_icon_pixmap))
+        copy_text_button.setIcon(QIcon(get_icon_pixmap("copy")))
         copy_text_button.setIconSize(QSize(32, 32))
         copy_text_button.clicked.connect(self.copy_image_to_clipboard)
         share_options_layout.addWidget(copy_text_button)
@@ -159,9 +166,7 @@ class ShareDialog(QDialog):
         download_button.setText("Download")
         download_button.setFixedSize(110, 60)
         download_button.setStyleSheet(tool_button_stylesheet)
-        download_icon_pixmap = QPixmap()
-        download_icon_pixmap.loadFromData(base64.b64decode(get_base64_icon_data("download").split(",")[1]))
-        download_button.setIcon(QIcon(download_icon_pixmap))
+        download_button.setIcon(QIcon(get_icon_pixmap("download")))
         download_button.setIconSize(QSize(32, 32))
         download_button.clicked.connect(self.save_streak_image)
         share_options_layout.addWidget(download_button)
@@ -170,9 +175,7 @@ class ShareDialog(QDialog):
         twitter_button.setText("Share to X")
         twitter_button.setFixedSize(110, 60)
         twitter_button.setStyleSheet(tool_button_stylesheet)
-        twitter_icon_pixmap = QPixmap()
-        twitter_icon_pixmap.loadFromData(base64.b64decode(get_base64_icon_data("x").split(",")[1]))
-        twitter_button.setIcon(QIcon(twitter_icon_pixmap))
+        twitter_button.setIcon(QIcon(get_icon_pixmap("x")))
         twitter_button.setIconSize(QSize(32, 32))
         twitter_button.clicked.connect(self.share_to_twitter)
         share_options_layout.addWidget(twitter_button)
@@ -181,9 +184,7 @@ class ShareDialog(QDialog):
         facebook_button.setText("Share to Facebook")
         facebook_button.setFixedSize(110, 60)
         facebook_button.setStyleSheet(tool_button_stylesheet)
-        facebook_icon_pixmap = QPixmap()
-        facebook_icon_pixmap.loadFromData(base64.b64decode(get_base64_icon_data("facebook").split(",")[1]))
-        facebook_button.setIcon(QIcon(facebook_icon_pixmap))
+        facebook_button.setIcon(QIcon(get_icon_pixmap("facebook")))
         facebook_button.setIconSize(QSize(32, 32))
         facebook_button.clicked.connect(self.share_to_facebook)
         share_options_layout.addWidget(facebook_button)
@@ -194,6 +195,23 @@ class ShareDialog(QDialog):
         close_button.clicked.connect(self.close)
         main_layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
+        self._prepare_share_card()
+
+    def _prepare_share_card(self):
+        # Render and encode the card in the background while the dialog is
+        # shown; copy and download then reuse the cached result.
+        streak, reviewed_today = self.current_streak, self.reviewed_today
+        scale, quality = self.image_scale, self.image_qualities["PNG"]
+
+        def on_done(future):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"AnkiStreak: Error preparing share image: {e}")
+
+        mw.taskman.run_in_background(
+            lambda: encode_share_card(streak, reviewed_today, "PNG", scale, quality), on_done)
+
     def show_copied_message(self, widget: QWidget):
         global_pos = widget.mapToGlobal(QPoint(0, 0))
         tooltip_x = global_pos.x() + widget.width() // 2
@@ -207,13 +225,8 @@ class ShareDialog(QDialog):
         self.show_copied_message(self.sender())
 
     def copy_image_to_clipboard(self):
-        pixmap = QPixmap(self.streak_visual_section.size())
-        pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(pixmap)
-        self.streak_visual_section.render(painter)
-        painter.end()
-
-        QApplication.instance().clipboard().setPixmap(pixmap)
+        image = get_share_card(self.current_streak, self.reviewed_today, self.image_scale)
+        QApplication.instance().clipboard().setImage(image)
 
         self.show_copied_message(self.sender())
 
@@ -232,18 +245,31 @@ class ShareDialog(QDialog):
         QDesktopServices.openUrl(QUrl(facebook_url))
 
     def save_streak_image(self):
-        pixmap = QPixmap(self.streak_visual_section.size())
-        pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(pixmap)
-        self.streak_visual_section.render(painter)
-        painter.end()
-
         downloads_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
         default_file_name = f"{downloads_path}/anki_streak.png"
 
-        file_name, _ = QFileDialog.getSaveFileName(self,
-                                                   "Save Streak Image",
-                                                   default_file_name,
-                                                   "PNG Image (*.png);;All Files (*)")
-        if file_name:
-            pixmap.save(file_name)
\ No newline at end of file
+        file_name, selected_filter = QFileDialog.getSaveFileName(self,
+                                                                 "Save Streak Image",
+                                                                 default_file_name,
+                                                                 SAVE_FILE_FILTERS)
+        if not file_name:
+            return
+
+        if "." not in file_name.rsplit("/", 1)[-1]:
+            # No extension typed: take it from the chosen filter.
+            for image_format, (extensions, _) in SHARE_IMAGE_FORMATS.items():
+                if f"*.{extensions[0]}" in selected_filter:
+                    file_name = f"{file_name}.{extensions[0]}"
+                    break
+            else:
+                file_name = f"{file_name}.png"
+
+        image_format = image_format_for_file(file_name)
+        try:
+            payload = encode_share_card(self.current_streak, self.reviewed_today, image_format,
+                                        self.image_scale, self.image_qualities[image_format])
+            with open(file_name, "wb") as f:
+                f.write(payload)
+        except Exception as e:
+            print(f"AnkiStreak: Error saving share image: {e}")
+            showWarning(f"Could not save the streak image to {file_name}:\n{e}", parent=self)
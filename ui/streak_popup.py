@@ -1,7 +1,6 @@
-import base64
 import PyQt6.QtCore as QtCore
 from PyQt6.QtCore import Qt as QtCoreQt, QSize
-from PyQt6.QtGui import QPixmap, QFont, QIcon
+from PyQt6.QtGui import QFont, QIcon
 from PyQt6.QtWidgets import (
     QDialog, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QFrame, QWidget
@@ -9,7 +8,7 @@ from PyQt6.QtWidgets import (
 
 from ..logic.streak_manager import get_streak_manager
 from .calendar_widget import CalendarWidget
-from .icon import get_base64_icon_data
+from .icon import get_icon_pixmap
 
 class StreakPopup(QDialog):
     def __init__(self, parent=None):
@@ -21,8 +20,7 @@ class StreakPopup(QDialog):
         self.setWindowModality(QtCoreQt.WindowModality.ApplicationModal)
         self.setFixedSize(520, 700)
         self.drag_pos = None
-
-        streak = self.streak_manager.get_current_streak_length()
+        self._state_version = None
 
         self.header_widget = QWidget()
         self.header_widget.setFixedHeight(30)
@@ -61,9 +59,7 @@ class StreakPopup(QDialog):
                 border-radius: 5px;
             }
         """)
-        share_icon_pixmap = QPixmap()
-        share_icon_pixmap.loadFromData(base64.b64decode(get_base64_icon_data("share").split(",")[1]))
-        share_button.setIcon(QIcon(share_icon_pixmap))
+        share_button.setIcon(QIcon(get_icon_pixmap("share")))
         share_button.setIconSize(QSize(24, 24)) # Set icon size explicitly
         share_button.clicked.connect(self.open_share_window)
 
@@ -79,8 +75,8 @@ class StreakPopup(QDialog):
         separator.setFixedHeight(1)
         separator.setStyleSheet("background-color: white;") # Simpler styling for a solid line
 
-        top_widget = QWidget()
-        top_widget.setFixedHeight(120)
+        self.top_widget = QWidget()
+        self.top_widget.setFixedHeight(120)
 
         top_layout = QVBoxLayout()
         top_layout.setContentsMargins(0, 4, 0, 0)
@@ -93,41 +89,23 @@ class StreakPopup(QDialog):
         text_layout.setContentsMargins(12, 0, 0, 0)
         text_layout.setAlignment(QtCoreQt.AlignmentFlag.AlignTop | QtCoreQt.AlignmentFlag.AlignLeft)
 
-        self.streak_number_label = QLabel(str(self.streak_manager.get_current_streak_length()))
+        self.streak_number_label = QLabel()
         self.streak_number_label.setFont(QFont("Arial", 52, QFont.Weight.Bold))
 
-        day_label = QLabel("day streak!")
-        day_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
+        self.day_label = QLabel("day streak!")
+        self.day_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
 
         text_layout.addWidget(self.streak_number_label)
-        text_layout.addWidget(day_label)
+        text_layout.addWidget(self.day_label)
         content_layout.addLayout(text_layout)
 
-        if self.streak_manager.has_reviewed_today():
-            self.header_widget.setStyleSheet("background-color: #d67e00;")
-            top_widget.setStyleSheet("background-color: #d67e00;")
-            self.streak_number_label.setStyleSheet("color: white;")
-            day_label.setStyleSheet("color: white;")
-            icon_data_uri = get_base64_icon_data("streak")
-        else:
-            top_widget.setStyleSheet("background-color: #2e2e2e;")
-            self.header_widget.setStyleSheet("background-color: #2e2e2e;")
-            self.streak_number_label.setStyleSheet("color: #AAAAAA;")
-            day_label.setStyleSheet("color: #AAAAAA;")
-            icon_data_uri = get_base64_icon_data("grey_streak")
-
-        icon_label = QLabel()
-        pixmap = QPixmap()
-        pixmap.loadFromData(base64.b64decode(icon_data_uri.split(",")[1]))
-        scaled_pixmap = pixmap.scaled(100, 100, QtCore.Qt.AspectRatioMode.KeepAspectRatio,
-                                      QtCore.Qt.TransformationMode.SmoothTransformation)
-        icon_label.setPixmap(scaled_pixmap)
-        icon_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
-        icon_label.setContentsMargins(6, 6, 2, 0)
-
-        content_layout.addWidget(icon_label)
+        self.icon_label = QLabel()
+        self.icon_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight)
+        self.icon_label.setContentsMargins(6, 6, 2, 0)
+
+        content_layout.addWidget(self.icon_label)
         top_layout.addLayout(content_layout)
-        top_widget.setLayout(top_layout)
+        self.top_widget.setLayout(top_layout)
 
         bottom_widget = QWidget()
         bottom_widget.setStyleSheet("background-color: #2e2e2e;")
@@ -145,11 +123,40 @@ class StreakPopup(QDialog):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(self.header_widget)
         main_layout.addWidget(separator)
-        main_layout.addWidget(top_widget)
+        main_layout.addWidget(self.top_widget)
         main_layout.addWidget(bottom_widget)
 
         self.setLayout(main_layout)
 
+        self.refresh()
+
+    def refresh(self):
+        # The popup is kept between openings. The calendar reopens on the
+        # current period and serves its cells from its own caches; the
+        # header is only restyled when the streak state has changed.
+        self.calendar_widget.show_current_period()
+
+        state_version = self.streak_manager.get_state_version()
+        if state_version == self._state_version:
+            return
+        self._state_version = state_version
+
+        self.streak_number_label.setText(str(self.streak_manager.get_current_streak_length()))
+
+        if self.streak_manager.has_reviewed_today():
+            self.header_widget.setStyleSheet("background-color: #d67e00;")
+            self.top_widget.setStyleSheet("background-color: #d67e00;")
+            self.streak_number_label.setStyleSheet("color: white;")
+            self.day_label.setStyleSheet("color: white;")
+            icon_name = "streak"
+        else:
+            self.top_widget.setStyleSheet("background-color: #2e2e2e;")
+            self.header_widget.setStyleSheet("background-color: #2e2e2e;")
+            self.streak_number_label.setStyleSheet("color: #AAAAAA;")
+            self.day_label.setStyleSheet("color: #AAAAAA;")
+            icon_name = "grey_streak"
+        self.icon_label.setPixmap(get_icon_pixmap(icon_name, 100))
+
     def open_share_window(self):
         from .share_dialog import ShareDialog
         dialog = ShareDialog(self)
@@ -172,6 +179,14 @@ class StreakPopup(QDialog):
         self.drag_pos = None
         event.accept()
 
+# Built on the first toolbar click and hidden, not destroyed, on close.
+_streak_popup = None
+
+
 def open_streak_popup_with_manager(parent):
-    popup = StreakPopup(parent)
-    popup.exec()
\ No newline at end of file
+    global _streak_popup
+    if _streak_popup is None or _streak_popup.parent() is not parent:
+        _streak_popup = StreakPopup(parent)
+    else:
+        _streak_popup.refresh()
+    _streak_popup.exec()
@@ -0,0 +1,162 @@
+from datetime import date
+from PyQt6.QtCore import Qt, QEvent, QPoint, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QCursor, QFont, QImage, QPainter
+from PyQt6.QtWidgets import QToolTip, QWidget
+
+from ..logic.day_index import DAY_FROZEN, DAY_REVIEWED
+
+HEATMAP_COLORS = {
+    0: QColor("#444444"),
+    DAY_FROZEN: QColor("#44B1F9"),
+    DAY_REVIEWED: QColor("#D67E00"),
+}
+TODAY_OUTLINE = QColor("#FFFFFF")
+STATE_NAMES = {0: "no reviews", DAY_FROZEN: "streak freeze", DAY_REVIEWED: "reviewed"}
+
+
+# Contribution-style view of whole years: one strip per year, one column per
+# week (Monday first), one small square per day. Day states come from a
+# single DayIndex.day_states call and are painted once into a cached image;
+# paintEvent only blits it.
+class YearHeatmap(QWidget):
+    day_clicked = pyqtSignal(object, QRect)
+
+    CELL_SIZE = 6
+    CELL_STEP = 7
+    WEEKS = 54
+    LABEL_WIDTH = 44
+    YEAR_PADDING = 6
+    YEAR_HEIGHT = 7 * CELL_STEP + 2 * YEAR_PADDING
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.years = []
+        self._grid_starts = []
+        self._states = bytearray()
+        self._first_ordinal = 0
+        self._today_ordinal = 0
+        self._render_key = None
+        self._image = None
+        self.setMouseTracking(True)
+
+        self._label_font = QFont()
+        self._label_font.setPixelSize(13)
+        self._label_font.setBold(True)
+
+    def set_years(self, years: list, day_index, today_ordinal: int, version: int):
+        # `version` identifies the day index contents; an unchanged key keeps
+        # the current image.
+        key = (tuple(years), version, today_ordinal)
+        if key == self._render_key:
+            return
+        self._render_key = key
+        self.years = list(years)
+        self._today_ordinal = today_ordinal
+
+        # Each strip starts on the Monday on or before 1 January.
+        self._grid_starts = []
+        for year in self.years:
+            jan_first = date(year, 1, 1).toordinal()
+            self._grid_starts.append(jan_first - (jan_first - 1) % 7)
+
+        if self.years:
+            self._first_ordinal = min(self._grid_starts)
+            last_ordinal = date(max(self.years), 12, 31).toordinal()
+            self._states = day_index.day_states(self._first_ordinal, last_ordinal)
+        else:
+            self._states = bytearray()
+
+        self.setFixedSize(self.LABEL_WIDTH + self.WEEKS * self.CELL_STEP,
+                          max(1, len(self.years)) * self.YEAR_HEIGHT)
+        self._image = None
+        self.update()
+
+    def _cell_rect(self, strip: int, ordinal: int) -> QRect:
+        offset = ordinal - self._grid_starts[strip]
+        column, row = divmod(offset, 7)
+        x = self.LABEL_WIDTH + column * self.CELL_STEP
+        y = strip * self.YEAR_HEIGHT + self.YEAR_PADDING + row * self.CELL_STEP
+        return QRect(x, y, self.CELL_SIZE, self.CELL_SIZE)
+
+    def _render(self) -> QImage:
+        ratio = self.devicePixelRatioF()
+        image = QImage(int(self.width() * ratio), int(self.height() * ratio),
+                       QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(ratio)
+        image.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(image)
+        painter.setFont(self._label_font)
+        for strip, year in enumerate(self.years):
+            label_rect = QRect(0, strip * self.YEAR_HEIGHT, self.LABEL_WIDTH - 6, self.YEAR_HEIGHT)
+            painter.setPen(QColor("white"))
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, str(year))
+
+            first = date(year, 1, 1).toordinal()
+            last = min(date(year, 12, 31).toordinal(), self._today_ordinal)
+            for ordinal in range(first, last + 1):
+                state = self._states[ordinal - self._first_ordinal]
+                painter.fillRect(self._cell_rect(strip, ordinal), HEATMAP_COLORS[state])
+
+            if first <= self._today_ordinal <= date(year, 12, 31).toordinal():
+                painter.setPen(TODAY_OUTLINE)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRect(self._cell_rect(strip, self._today_ordinal).adjusted(0, 0, -1, -1))
+        painter.end()
+        return image
+
+    def paintEvent(self, event):
+        if self._image is None or self._image.devicePixelRatio() != self.devicePixelRatioF():
+            self._image = self._render()
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self._image)
+        painter.end()
+
+    def ordinal_at(self, pos: QPoint):
+        # Returns (strip, ordinal) for the day under `pos`, or None.
+        strip = pos.y() // self.YEAR_HEIGHT
+        if not 0 <= strip < len(self.years):
+            return None
+        column = (pos.x() - self.LABEL_WIDTH) // self.CELL_STEP
+        row = (pos.y() - strip * self.YEAR_HEIGHT - self.YEAR_PADDING) // self.CELL_STEP
+        if pos.x() < self.LABEL_WIDTH or not 0 <= row < 7:
+            return None
+
+        ordinal = self._grid_starts[strip] + column * 7 + row
+        year = self.years[strip]
+        if not date(year, 1, 1).toordinal() <= ordinal <= min(date(year, 12, 31).toordinal(), self._today_ordinal):
+            return None
+        if not self._cell_rect(strip, ordinal).contains(pos):
+            return None
+        return strip, ordinal
+
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            hit = self.ordinal_at(event.pos())
+            if hit is None:
+                QToolTip.hideText()
+            else:
+                ordinal = hit[1]
+                state = self._states[ordinal - self._first_ordinal]
+                text = f"{date.fromordinal(ordinal).strftime('%a %d %b %Y')}: {STATE_NAMES[state]}"
+                QToolTip.showText(event.globalPos(), text, self)
+            return True
+        return super().event(event)
+
+    def mouseMoveEvent(self, event):
+        if self.ordinal_at(event.position().toPoint()) is None:
+            self.unsetCursor()
+        else:
+            self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        super().mouseMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            hit = self.ordinal_at(event.position().toPoint())
+            if hit is not None:
+                strip, ordinal = hit
+                rect = self._cell_rect(strip, ordinal)
+                global_rect = QRect(self.mapToGlobal(rect.topLeft()), rect.size())
+                self.day_clicked.emit(date.fromordinal(ordinal), global_rect)
+                return
+        super().mousePressEvent(event)